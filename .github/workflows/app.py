@@ -1,15 +1,41 @@
 import streamlit as st
 import pandas as pd
-import hashlib
 import datetime
-import base64
 import time
-from PIL import Image
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
 import os
-import io
+import sys
+
+# Shared modules live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from charts import show_status_chart
+from verification import (
+    certificates_zip,
+    count_institutions,
+    GROUPS,
+    fingerprint_upload,
+    get_stats,
+    get_timings,
+    image_preview,
+    list_institutions,
+    perceptual_hash_upload,
+    profiled,
+    issue_credential,
+    issue_credentials_bulk,
+    read_credential_ids,
+    read_roster,
+    recent_activity,
+    recent_revocations,
+    register_institution,
+    review_institution,
+    revoke_credential,
+    render_certificate,
+    search_credentials,
+    serve_metrics,
+    verify_batch,
+    verify_by_id,
+    verify_document,
+)
 
 # Page configuration
 st.set_page_config(
@@ -19,56 +45,59 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Stylesheet contents, read from disk once per process
+@st.cache_resource
+def load_css(file_name):
+    try:
+        with open(file_name) as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
 # Custom CSS for styling
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    css = load_css(file_name)
+    if css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 local_css("style.css")
 
-# Sample data for demonstration
-def generate_sample_data():
-    institutions = pd.DataFrame({
-        'Institution ID': ['UNIV-001', 'UNIV-002', 'UNIV-003'],
-        'Name': ['Tech University', 'Science Institute', 'Global College'],
-        'Country': ['USA', 'UK', 'Canada'],
-        'Verification Status': ['Verified', 'Verified', 'Pending']
-    })
-    
-    credentials = pd.DataFrame({
-        'Credential ID': ['CRED-001', 'CRED-002', 'CRED-003'],
-        'Student Name': ['John Smith', 'Emma Johnson', 'Michael Brown'],
-        'Institution': ['Tech University', 'Science Institute', 'Global College'],
-        'Degree': ['BSc Computer Science', 'PhD Physics', 'MBA'],
-        'Issue Date': ['2020-06-15', '2018-12-10', '2021-05-20'],
-        'Verification Status': ['Verified', 'Verified', 'Pending'],
-        'Blockchain Hash': ['a1b2c3...', 'd4e5f6...', 'x7y8z9...']
-    })
-    
-    return institutions, credentials
+# Shared read-only data is handed to every session as-is; under copy-on-write
+# (always on from pandas 3) a session that modifies a frame gets its own copy
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
-# Generate blockchain-like hash for credentials
-def generate_blockchain_hash(data):
-    timestamp = str(datetime.datetime.now())
-    data_string = str(data) + timestamp
-    return hashlib.sha256(data_string.encode()).hexdigest()[:12] + "..."
+# Dashboard aggregates, built once for all sessions and refreshed every few seconds
+@st.cache_resource(ttl=5)
+def load_dashboard_stats():
+    stats = get_stats().snapshot()
+    for name in GROUPS:
+        stats[name] = pd.DataFrame(stats[name], columns=[name, "Credentials"]).set_index(name)
+    return stats
 
-# Verification status visualization
-def plot_verification_status(df):
-    status_counts = df['Verification Status'].value_counts()
-    
-    fig, ax = plt.subplots(figsize=(6, 3))
-    colors = ['#4CAF50' if status == 'Verified' else '#FFC107' if status == 'Pending' else '#F44336' for status in status_counts.index]
-    ax.barh(status_counts.index, status_counts.values, color=colors)
-    ax.set_xlabel('Count')
-    ax.set_title('Verification Status Distribution')
-    plt.tight_layout()
-    return fig
+# Dashboard aggregates as a CSV download
+def dashboard_report(stats):
+    frames = [stats[name].rename_axis("Value").reset_index().assign(Group=name) for name in GROUPS]
+    return pd.concat(frames)[["Group", "Value", "Credentials"]].to_csv(index=False).encode()
+
+# Quick Action target; runs before the next script run, so the selectbox
+# picks up the new page without an extra rerun
+def go_to(page):
+    st.session_state.menu = page
+
+# signature_valid from the verification core -> display text
+SIGNATURE_LABELS = {True: "Valid", False: "Invalid", None: "Unsigned (issued before signing)"}
+
+# cProfile report for a request made with profiling on (see the Metrics page)
+def show_profile(capture):
+    if capture:
+        with st.expander("🔬 Request Profile"):
+            st.code(capture.text(), language="text")
 
 # Main application
 def main():
-    # Load sample data
-    institutions, credentials = generate_sample_data()
+    # Prometheus text on 127.0.0.1:METRICS_PORT, started once per process
+    serve_metrics()
     
     # Sidebar with logo and navigation
     with st.sidebar:
@@ -76,7 +105,10 @@ def main():
         st.title("Academic Credential Verification")
         st.subheader("Secure • Trusted • Global")
         
-        menu = st.selectbox("Navigation", ["Dashboard", "Verify Credential", "Institution Portal", "Documentation", "About"])
+        pages = ["Dashboard", "Verify Credential", "Institution Portal", "Documentation", "About"]
+        if st.query_params.get("metrics") == "1":
+            pages.append("Metrics")
+        menu = st.selectbox("Navigation", pages, key="menu")
         st.markdown("---")
         
         st.info("""
@@ -94,11 +126,13 @@ def main():
     if menu == "Dashboard":
         st.header("📊 Verification Dashboard")
         
+        stats = load_dashboard_stats()
+        
         # Stats cards
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Credentials Verified", "1,842", "12% increase")
-        col2.metric("Active Institutions", "127", "3 new")
-        col3.metric("Verification Success Rate", "98.7%", "0.3% improvement")
+        col1.metric("Total Credentials Verified", f"{stats['verified']:,}")
+        col2.metric("Active Institutions", f"{stats['institutions']:,}")
+        col3.metric("Verification Success Rate", f"{stats['success_rate']:.1%}" if stats['success_rate'] is not None else "—")
         
         st.markdown("---")
         
@@ -107,158 +141,181 @@ def main():
         with col1:
             st.subheader("Recent Verification Activities")
             
-            # Create sample activity data
-            activities = pd.DataFrame({
-                'Timestamp': pd.date_range(end=pd.Timestamp.now(), periods=10, freq='H'),
-                'Activity': ['Verification started', 'Document uploaded', 'Institution verified', 
-                             'Credential issued', 'Verification completed', 'New institution added',
-                             'Credential updated', 'Security audit', 'Blockchain updated', 'Report generated'],
-                'Status': ['In Progress', 'Completed', 'Completed', 'Completed', 'Completed',
-                           'Completed', 'Completed', 'Completed', 'Completed', 'Completed']
-            })
-            
-            st.dataframe(activities.sort_values('Timestamp', ascending=False).head(5), 
-                         hide_index=True, use_container_width=True)
+            # Newest entries from the audit log, already newest first
+            activities = pd.DataFrame(recent_activity(5), columns=["Timestamp", "Activity", "Subject", "Status"])
+            st.dataframe(activities, hide_index=True, use_container_width=True)
             
             # Verification metrics
             st.subheader("Verification Metrics")
             tab1, tab2, tab3 = st.tabs(["By Country", "By Institution", "By Degree"])
             
             with tab1:
-                # Sample country data
-                country_data = pd.DataFrame({
-                    'Country': ['USA', 'UK', 'Canada', 'Australia', 'Germany'],
-                    'Credentials': [850, 420, 320, 150, 102]
-                })
-                st.bar_chart(country_data.set_index('Country'))
+                st.bar_chart(stats["Country"])
                 
             with tab2:
-                # Sample institution data
-                inst_data = pd.DataFrame({
-                    'Institution': ['Tech University', 'Science Institute', 'Global College', 
-                                    'Metropolitan University', 'Polytechnic Institute'],
-                    'Credentials': [450, 380, 290, 220, 180]
-                })
-                st.bar_chart(inst_data.set_index('Institution'))
+                st.bar_chart(stats["Institution"])
                 
             with tab3:
-                # Sample degree data
-                degree_data = pd.DataFrame({
-                    'Degree': ['BSc Computer Science', 'MBA', 'PhD Physics', 
-                               'BA Economics', 'MEng Civil Engineering'],
-                    'Credentials': [420, 380, 250, 210, 180]
-                })
-                st.bar_chart(degree_data.set_index('Degree'))
+                st.bar_chart(stats["Degree"])
         
         with col2:
             st.subheader("Verification Status")
-            st.pyplot(plot_verification_status(credentials))
+            status_counts = stats["Verification Status"]["Credentials"]
+            show_status_chart(st, status_counts)
             
             st.subheader("Security Alerts")
             st.success("✅ All systems operational")
-            st.info("ℹ️ 3 pending verifications")
+            st.info(f"ℹ️ {status_counts.get('Pending', 0):,} pending verifications")
             st.warning("⚠️ 1 document requires additional review")
             
             st.subheader("Quick Actions")
-            if st.button("🔍 Start New Verification", use_container_width=True):
-                st.session_state.menu = "Verify Credential"
-                st.experimental_rerun()
-                
-            if st.button("🏫 Add New Institution", use_container_width=True):
-                st.session_state.menu = "Institution Portal"
-                st.experimental_rerun()
-                
-            if st.button("📄 Generate Report", use_container_width=True):
-                st.success("Report generation in progress...")
-                time.sleep(1)
-                st.success("✅ Report generated successfully!")
+            st.button("🔍 Start New Verification", use_container_width=True,
+                      on_click=go_to, args=("Verify Credential",))
+            st.button("🏫 Add New Institution", use_container_width=True,
+                      on_click=go_to, args=("Institution Portal",))
+            st.download_button(
+                label="📄 Generate Report",
+                data=lambda: dashboard_report(stats),
+                file_name=f"verification_report_{datetime.date.today():%Y%m%d}.csv",
+                mime="text/csv",
+                on_click="ignore",
+                use_container_width=True
+            )
                 
     # Verify Credential
     elif menu == "Verify Credential":
         st.header("🔍 Verify Academic Credential")
         
-        tab1, tab2 = st.tabs(["Verify by Document", "Verify by Credential ID"])
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["Verify by Document", "Verify by Credential ID", "Batch Verification", "Search Credentials"]
+        )
         
         with tab1:
             st.subheader("Upload Academic Document")
             uploaded_file = st.file_uploader("Upload PDF, JPG, or PNG of your academic credential", 
                                             type=["pdf", "jpg", "jpeg", "png"])
             
-            if uploaded_file is not None:
+            # Images are checked and downscaled once; reruns reuse the cached preview
+            preview, upload_error = None, None
+            if uploaded_file is not None and uploaded_file.type != "application/pdf":
+                try:
+                    preview = image_preview(uploaded_file)
+                except ValueError as e:
+                    upload_error = str(e)
+            
+            if upload_error:
+                st.error(f"❌ {upload_error}")
+            elif uploaded_file is not None:
                 # Display document preview
                 if uploaded_file.type == "application/pdf":
                     st.image("https://cdn-icons-png.flaticon.com/512/337/337946.png", width=100)
                     st.caption("PDF document uploaded")
                 else:
-                    st.image(uploaded_file, width=300)
+                    st.image(preview, width=300)
                 
                 # Extract metadata
+                document_hash = fingerprint_upload(uploaded_file)
                 file_details = {
                     "File Name": uploaded_file.name,
                     "File Type": uploaded_file.type,
-                    "File Size": f"{uploaded_file.size / 1024:.2f} KB"
+                    "File Size": f"{uploaded_file.size / 1024:.2f} KB",
+                    "SHA-256": document_hash
                 }
                 st.json(file_details)
                 
                 # Verification process
                 st.subheader("Verification Process")
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                steps = [
-                    "Uploading document...",
-                    "Extracting document content...",
-                    "Verifying document authenticity...",
-                    "Checking against institutional records...",
-                    "Validating with blockchain registry...",
-                    "Finalizing verification..."
-                ]
-                
-                for i, step in enumerate(steps):
-                    progress_bar.progress((i + 1) / len(steps))
-                    status_text.info(f"⏳ {step}")
-                    time.sleep(1)
-                
-                # Verification result
-                progress_bar.empty()
-                status_text.empty()
-                
-                st.success("✅ Verification Complete!")
-                
-                # Display verification report
-                with st.expander("Verification Report", expanded=True):
-                    col1, col2 = st.columns(2)
+                if st.button("Start Verification", type="primary"):
+                    progress_bar = st.progress(0)
+                    status_text = st.empty()
                     
-                    # Sample verification data
-                    verification_data = {
-                        "Credential ID": "CRED-004",
-                        "Document Type": "Bachelor's Degree",
-                        "Institution": "Tech University",
-                        "Student Name": "Sarah Williams",
-                        "Degree": "BSc Computer Science",
-                        "Issue Date": "June 15, 2023",
-                        "Verification Status": "Verified",
-                        "Verification Date": datetime.date.today().strftime("%Y-%m-%d"),
-                        "Blockchain Hash": generate_blockchain_hash("CRED-004"),
-                        "Security Seal": "Valid"
-                    }
+                    def show_progress(completed, total, label):
+                        progress_bar.progress(completed / total)
+                        status_text.info(f"⏳ {label}")
                     
-                    col1.subheader("Credential Details")
-                    for key, value in verification_data.items():
-                        col1.markdown(f"**{key}**: {value}")
+                    with profiled(st.session_state.get("profiling", False)) as capture:
+                        result = verify_document(uploaded_file, on_progress=show_progress)
+                    show_profile(capture)
+                    record = result["record"]
                     
-                    col2.subheader("Security Validation")
-                    col2.image("https://cdn-icons-png.flaticon.com/512/545/545783.png", width=80)
-                    col2.success("Blockchain Verification: Valid")
-                    col2.success("Digital Signature: Valid")
-                    col2.success("Document Integrity: Valid")
+                    # Verification result
+                    progress_bar.empty()
+                    status_text.empty()
                     
-                    st.download_button(
-                        label="📄 Download Verification Certificate",
-                        data=io.BytesIO(b"Sample verification certificate content"),
-                        file_name="verification_certificate.pdf",
-                        mime="application/pdf"
-                    )
+                    if result["extraction_error"]:
+                        st.warning(result["extraction_error"])
+                    
+                    if result["tamper_suspected"]:
+                        credential_id, distance = result["tamper_match"]
+                        st.warning(f"⚠️ Possible altered copy: resembles the document issued for {credential_id} "
+                                   f"({distance} of 64 fingerprint bits differ) but is not identical to it")
+                    
+                    if result["revocation"]:
+                        st.error(f"⛔ Credential revoked on {result['revocation']['Revoked']}: "
+                                 f"{result['revocation']['Reason'] or 'no reason given'}")
+                    
+                    if record is None:
+                        st.error("❌ No issued credential matches this document")
+                        st.subheader("Extracted Details")
+                        st.json(result["fields"])
+                    else:
+                        if result["verified"]:
+                            st.success("✅ Verification Complete!")
+                        else:
+                            st.error("❌ Verification Failed: the document does not match a valid issued credential")
+                        
+                        # Display verification report
+                        with st.expander("Verification Report", expanded=True):
+                            col1, col2 = st.columns(2)
+                            
+                            verification_data = {
+                                "Credential ID": record["Credential ID"],
+                                "Institution": record["Institution"],
+                                "Student Name": record["Student Name"],
+                                "Degree": record["Degree"],
+                                "Issue Date": record["Issue Date"],
+                                "Verification Status": record["Verification Status"],
+                                "Verification Date": datetime.date.today().strftime("%Y-%m-%d"),
+                                "Blockchain Hash": record["Blockchain Hash"],
+                                "Document Hash": f"`{result['document_hash']}`",
+                                "Security Seal": "Valid" if result["verified"] else "Invalid"
+                            }
+                            
+                            col1.subheader("Credential Details")
+                            for key, value in verification_data.items():
+                                col1.markdown(f"**{key}**: {value}")
+                            
+                            col2.subheader("Security Validation")
+                            col2.image("https://cdn-icons-png.flaticon.com/512/545/545783.png", width=80)
+                            if result["ledger_valid"]:
+                                col2.success("Blockchain Verification: Valid")
+                            else:
+                                col2.error("Blockchain Verification: No ledger entry")
+                            if result["signature_valid"]:
+                                col2.success("Digital Signature: Valid")
+                            elif result["signature_valid"] is None:
+                                col2.info("Digital Signature: Issued before signing was introduced")
+                            else:
+                                col2.error("Digital Signature: Invalid")
+                            if result["authentic"]:
+                                col2.success("Document Integrity: Valid")
+                            else:
+                                col2.warning("Document Integrity: No issued record with this fingerprint")
+                            
+                            # A certificate vouches for the document, so only offer one for a verified, unrevoked credential
+                            if result["verified"] and not result["revocation"]:
+                                st.download_button(
+                                    label="📄 Download Verification Certificate",
+                                    data=render_certificate(record),
+                                    file_name=f"{record['Credential ID']}_verification_certificate.pdf",
+                                    mime="application/pdf"
+                                )
+                    
+                    if result["cached"]:
+                        st.caption("Document verified earlier; result served from cache")
+                    elif result["page_timings"]:
+                        with st.expander("Extraction Timing"):
+                            st.dataframe(pd.DataFrame(result["page_timings"]), hide_index=True)
         
         with tab2:
             st.subheader("Check Verification Status")
@@ -266,10 +323,14 @@ def main():
             
             if st.button("Check Status", type="primary"):
                 if credential_id:
-                    # Simulate checking against database
-                    if credential_id in credentials['Credential ID'].values:
-                        result = credentials[credentials['Credential ID'] == credential_id].iloc[0]
-                        
+                    with profiled(st.session_state.get("profiling", False)) as capture:
+                        lookup = verify_by_id(credential_id)
+                    result = lookup["credential"]
+                    show_profile(capture)
+                    if lookup["revocation"]:
+                        st.error(f"⛔ Credential revoked on {lookup['revocation']['Revoked']}: "
+                                 f"{lookup['revocation']['Reason'] or 'no reason given'}")
+                    elif result:
                         st.success(f"✅ Credential Found: {result['Degree']}")
                         
                         col1, col2 = st.columns(2)
@@ -280,6 +341,8 @@ def main():
                         col2.markdown(f"**Verification Status**: {result['Verification Status']}")
                         col2.markdown(f"**Last Verified**: {datetime.date.today().strftime('%Y-%m-%d')}")
                         col2.markdown(f"**Blockchain Hash**: `{result['Blockchain Hash']}`")
+                        col2.markdown(f"**Ledger Proof**: {'Valid' if lookup['ledger_valid'] else 'Not anchored'}")
+                        col2.markdown(f"**Digital Signature**: {SIGNATURE_LABELS[lookup['signature_valid']]}")
                         
                         if result['Verification Status'] == 'Verified':
                             st.balloons()
@@ -287,12 +350,62 @@ def main():
                         st.error("❌ Credential ID not found in our system")
                 else:
                     st.warning("Please enter a Credential ID")
+
+        with tab3:
+            st.subheader("Bulk Verification")
+            batch_file = st.file_uploader("Upload a CSV or Parquet file of Credential IDs", type=["csv", "parquet"])
+            
+            if batch_file and st.button("Verify Batch", type="primary"):
+                try:
+                    ids = read_credential_ids(batch_file)
+                except ImportError:
+                    st.error("Parquet support requires pyarrow to be installed")
+                    ids = None
+                
+                if ids is not None:
+                    report, elapsed = verify_batch(ids)
+                    
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("IDs Checked", f"{len(report):,}")
+                    col2.metric("Found", f"{int(report['Found'].sum()):,}")
+                    col3.metric("Throughput", f"{len(report) / max(elapsed, 1e-6):,.0f} IDs/sec")
+                    
+                    st.dataframe(report.head(100), hide_index=True, use_container_width=True)
+                    st.download_button(
+                        label="📄 Download Verification Report",
+                        data=report.to_csv(index=False).encode(),
+                        file_name="verification_report.csv",
+                        mime="text/csv"
+                    )
+        
+        with tab4:
+            st.subheader("Find a Credential")
+            query = st.text_input("Student Name, Institution or Degree", placeholder="e.g. Sarah Williams Tech University")
+            
+            if st.button("Search", type="primary"):
+                if query.strip():
+                    start = time.perf_counter()
+                    matches = search_credentials(query, limit=20)
+                    elapsed = time.perf_counter() - start
+                    
+                    if matches:
+                        st.dataframe(pd.DataFrame([
+                            {**record.to_dict(), "Match": f"{score:.0%}"} for record, score in matches
+                        ])[["Match", "Credential ID", "Student Name", "Institution", "Degree", "Issue Date", "Verification Status"]],
+                            hide_index=True, use_container_width=True)
+                        st.caption(f"{len(matches)} candidates in {elapsed * 1000:.1f} ms — verify a candidate by its Credential ID")
+                    else:
+                        st.error("❌ No matching credentials")
+                else:
+                    st.warning("Please enter a student name or institution")
     
     # Institution Portal
     elif menu == "Institution Portal":
         st.header("🏫 Institution Portal")
         
-        tab1, tab2 = st.tabs(["Register Institution", "Manage Credentials"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(
+            ["Register Institution", "Manage Credentials", "Bulk Issuance", "Review Queue", "Revocation"]
+        )
         
         with tab1:
             st.subheader("New Institution Registration")
@@ -309,18 +422,22 @@ def main():
                 submitted = st.form_submit_button("Submit Registration")
                 
                 if submitted:
-                    st.success("Registration submitted successfully!")
-                    st.info("Our verification team will review your application within 3-5 business days")
-                    
-                    # Generate institution ID
-                    inst_id = f"INST-{hashlib.sha256(name.encode()).hexdigest()[:6].upper()}"
-                    st.subheader("Your Institution Details")
-                    st.json({
-                        "Institution ID": inst_id,
-                        "Name": name,
-                        "Country": country,
-                        "Status": "Pending Verification"
-                    })
+                    try:
+                        institution = register_institution(name, country, email)
+                    except ValueError as e:
+                        st.error(f"❌ {e}")
+                    else:
+                        st.success("Registration submitted successfully!")
+                        st.info("Our verification team will review your application within 3-5 business days")
+                        
+                        st.subheader("Your Institution Details")
+                        st.json({
+                            "Institution ID": institution["Institution ID"],
+                            "Name": name,
+                            "Country": country,
+                            "Status": "Pending Verification",
+                            "Signing Public Key": institution["Public Key"]
+                        })
         
         with tab2:
             st.subheader("Credential Management")
@@ -330,27 +447,142 @@ def main():
                 with st.form("credential_form"):
                     student_name = st.text_input("Student Full Name")
                     student_id = st.text_input("Student ID")
+                    institution = st.text_input("Issuing Institution", help="Registered institution name or Institution ID")
+                    issuing_country = st.selectbox("Issuing Country", ["USA", "UK", "Canada", "Australia", "Germany", "Other"])
                     degree = st.text_input("Degree Awarded")
                     major = st.text_input("Major/Field of Study")
                     issue_date = st.date_input("Issue Date")
                     gpa = st.number_input("GPA (if applicable)", min_value=0.0, max_value=4.0, step=0.01)
+                    document = st.file_uploader("Credential Document (optional)", type=["pdf", "jpg", "jpeg", "png"])
                     
                     submitted = st.form_submit_button("Issue Credential")
                     
                     if submitted:
-                        # Generate credential ID and blockchain hash
-                        cred_id = f"CRED-{hashlib.sha256((student_name + degree).encode()).hexdigest()[:6].upper()}"
-                        blockchain_hash = generate_blockchain_hash(cred_id)
-                        
-                        st.success("🎓 Credential Issued Successfully!")
-                        st.json({
-                            "Credential ID": cred_id,
-                            "Student Name": student_name,
-                            "Degree": degree,
-                            "Issue Date": issue_date.strftime("%Y-%m-%d"),
-                            "Blockchain Hash": blockchain_hash,
-                            "Verification Status": "Verified"
-                        })
+                        # Anchor the credential in the ledger and persist it
+                        try:
+                            record = issue_credential(
+                                student_name, institution, degree, issue_date.strftime("%Y-%m-%d"),
+                                document_hash=fingerprint_upload(document) if document else None,
+                                country=issuing_country,
+                                perceptual_hash=perceptual_hash_upload(document) if document else None
+                            )
+                        except ValueError as e:
+                            st.error(f"❌ {e}")
+                        else:
+                            st.success("🎓 Credential Issued Successfully!")
+                            st.json({
+                                "Credential ID": record["Credential ID"],
+                                "Student Name": student_name,
+                                "Institution": institution,
+                                "Degree": degree,
+                                "Issue Date": record["Issue Date"],
+                                "Blockchain Hash": record["Blockchain Hash"],
+                                "Verification Status": record["Verification Status"]
+                            })
+
+        with tab3:
+            st.subheader("Bulk Credential Issuance")
+            roster_file = st.file_uploader("Upload graduation roster (CSV or Parquet)", type=["csv", "parquet"])
+            st.caption("Required columns: Student Name, Institution, Degree, Issue Date. "
+                       "Institutions must be registered and approved.")
+            
+            if roster_file and st.button("Issue Credentials", type="primary"):
+                try:
+                    roster = read_roster(roster_file)
+                    issued, rejected, timings = issue_credentials_bulk(roster)
+                except (ValueError, ImportError) as e:
+                    st.error(f"❌ {e}")
+                else:
+                    elapsed = sum(timings.values())
+                    
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Credentials Issued", f"{len(issued):,}")
+                    col2.metric("Duplicates Skipped", f"{len(roster) - len(issued) - len(rejected):,}")
+                    col3.metric("Throughput", f"{len(roster) / max(elapsed, 1e-6):,.0f} records/sec")
+                    
+                    if len(rejected):
+                        st.warning(f"⚠️ {len(rejected):,} roster rows were not issued")
+                        st.dataframe(rejected[["Row", "Error", "Student Name", "Institution", "Degree", "Issue Date"]],
+                                     hide_index=True)
+                    
+                    st.dataframe(
+                        pd.DataFrame({"Stage": list(timings), "Seconds": [round(t, 3) for t in timings.values()]}),
+                        hide_index=True
+                    )
+                    st.download_button(
+                        label="📄 Download Issued Credentials",
+                        data=issued.to_csv(index=False).encode(),
+                        file_name="issued_credentials.csv",
+                        mime="text/csv"
+                    )
+                    if len(issued):
+                        # Rendered only when clicked, streamed into the archive one chunk at a time
+                        st.download_button(
+                            label="🎓 Download Certificates (ZIP)",
+                            data=lambda records=issued.to_dict("records"): certificates_zip(records).read(),
+                            file_name="certificates.zip",
+                            mime="application/zip",
+                            on_click="ignore"
+                        )
+
+        with tab4:
+            st.subheader("Institution Registry")
+            registry_status = st.selectbox("Status", ["Pending", "Approved", "Rejected", "All"])
+            status_filter = None if registry_status == "All" else registry_status
+            
+            # Keyset pagination: the after_id of every page visited, per status
+            cursors = st.session_state.setdefault(f"registry_pages_{registry_status}", [""])
+            page, next_after = list_institutions(status_filter, after_id=cursors[-1])
+            st.caption(f"{count_institutions(status_filter):,} institutions · page {len(cursors)}")
+            st.dataframe(
+                pd.DataFrame(page, columns=["Institution ID", "Name", "Country", "Contact Email", "Status", "Registered"]),
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            col1, col2 = st.columns(2)
+            if col1.button("◀ Previous Page", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+            if col2.button("Next Page ▶", disabled=next_after is None):
+                cursors.append(next_after)
+                st.rerun()
+            
+            if status_filter == "Pending" and page:
+                application = st.selectbox(
+                    "Application", page, format_func=lambda i: f"{i['Name']} ({i['Institution ID']})"
+                )
+                col1, col2 = st.columns(2)
+                if col1.button("✅ Approve"):
+                    review_institution(application["Institution ID"], approve=True)
+                    st.rerun()
+                if col2.button("❌ Reject"):
+                    review_institution(application["Institution ID"], approve=False)
+                    st.rerun()
+
+        with tab5:
+            st.subheader("Revoke a Credential")
+            with st.form("revoke_credential"):
+                revoke_id = st.text_input("Credential ID")
+                revoke_reason = st.text_input("Reason")
+                
+                if st.form_submit_button("Revoke Credential", type="primary"):
+                    if not revoke_id:
+                        st.warning("Please enter a Credential ID")
+                    else:
+                        try:
+                            revoke_credential(revoke_id.strip(), revoke_reason.strip() or None)
+                        except ValueError as e:
+                            st.error(f"❌ {e}")
+                        else:
+                            st.success(f"✅ Credential {revoke_id.strip()} revoked")
+            
+            st.subheader("Recent Revocations")
+            st.dataframe(
+                pd.DataFrame(recent_revocations(), columns=["Credential ID", "Reason", "Revoked"]),
+                hide_index=True,
+                use_container_width=True
+            )
     
     # Documentation
     elif menu == "Documentation":
@@ -403,8 +635,37 @@ def main():
         
         response = requests.post(url, json=payload)
         print(response.json())
+        
+        # Batch verification (up to 10,000 IDs per request)
+        response = requests.post(
+            "https://api.academicverify.com/v1/verify/batch",
+            json={"credential_ids": ["CRED-123456", "CRED-654321"]},
+            headers={"X-API-Key": "YOUR_API_KEY"}
+        )
+        print(response.json()["results"])
         """)
     
+    # Metrics (hidden; open the app with ?metrics=1)
+    elif menu == "Metrics":
+        st.header("📈 Metrics")
+        st.caption("Stage latencies recorded by this server process over its most recent requests")
+        
+        summary = pd.DataFrame(
+            get_timings().summary(), columns=["Stage", "Count", "Mean ms", "p50 ms", "p95 ms", "p99 ms"]
+        )
+        if summary.empty:
+            st.info("No requests timed yet")
+        else:
+            st.dataframe(summary.round(2), hide_index=True, use_container_width=True)
+        
+        st.session_state.profiling = st.toggle(
+            "Profile my requests", value=st.session_state.get("profiling", False),
+            help="Verifications made in this session show a cProfile report while this is on"
+        )
+        
+        with st.expander("Prometheus Exposition"):
+            st.code(get_timings().prometheus(), language="text")
+    
     # About
     elif menu == "About":
         st.header("About AcademicVerify")
@@ -418,8 +679,9 @@ def main():
         st.subheader("Our Technology")
         col1, col2, col3 = st.columns(3)
         col1.metric("Blockchain Nodes", "24", "Globally distributed")
-        col2.metric("Verified Institutions", "127", "Across 35 countries")
-        col3.metric("Credentials Verified", "18,429", "Since 2020")
+        stats = load_dashboard_stats()
+        col2.metric("Verified Institutions", f"{stats['institutions']:,}", f"Across {len(stats['Country'])} countries")
+        col3.metric("Credentials Verified", f"{stats['verified']:,}")
         
         st.subheader("Security Certifications")
         st.markdown("""
@@ -0,0 +1,173 @@
+import asyncio
+import hmac
+import json
+import os
+
+from verification import get_ledger, get_result_cache, get_store, get_timings, verify_by_id, verify_by_ids
+from verification.metrics import PROMETHEUS_CONTENT_TYPE
+
+# Comma-separated API keys (set VERIFY_API_KEYS)
+API_KEYS = [key for key in os.environ.get("VERIFY_API_KEYS", "").split(",") if key]
+MAX_BODY_BYTES = 4 << 20
+MAX_BATCH_SIZE = 10_000
+# Batches at least this large are resolved off the event loop
+THREAD_BATCH_SIZE = 500
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Keys are compared as UTF-8 bytes, since compare_digest rejects non-ASCII str
+def _authorized(key):
+    if not isinstance(key, str):
+        return False
+    key = key.encode("utf-8", "surrogatepass")
+    return any(hmac.compare_digest(key, valid.encode()) for valid in API_KEYS)
+
+
+# API key from X-API-Key, Authorization: Bearer, or the JSON body; None when
+# a header is not valid UTF-8
+def _api_key(scope, payload):
+    headers = dict(scope["headers"])
+    try:
+        if b"x-api-key" in headers:
+            return headers[b"x-api-key"].decode()
+        authorization = headers.get(b"authorization", b"").decode()
+    except UnicodeDecodeError:
+        return None
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return payload.get("api_key")
+
+
+async def _read_json(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        body.extend(message.get("body", b""))
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        if not message.get("more_body"):
+            break
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Request body must be JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return payload
+
+
+async def _send_text(send, status, text, content_type):
+    body = text.encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status, payload):
+    await _send_text(send, status, json.dumps(payload, separators=(",", ":")), "application/json")
+
+
+def _jsonable(result):
+    if result["credential"] is not None:
+        result["credential"] = result["credential"].to_dict()
+    return result
+
+
+async def health(payload):
+    return {"status": "ok", "result_cache": get_result_cache().stats()}
+
+
+# GET /metrics: stage latencies for Prometheus to scrape
+async def metrics(payload):
+    return get_timings().prometheus()
+
+
+# POST /v1/verify {"credential_id": ...}
+async def verify(payload):
+    credential_id = payload.get("credential_id")
+    if not isinstance(credential_id, str) or not credential_id:
+        raise HTTPError(400, "credential_id is required")
+    return _jsonable(verify_by_id(credential_id))
+
+
+# POST /v1/verify/batch {"credential_ids": [...]}
+async def verify_batch(payload):
+    credential_ids = payload.get("credential_ids")
+    if not isinstance(credential_ids, list) or not all(isinstance(c, str) for c in credential_ids):
+        raise HTTPError(400, "credential_ids must be a list of strings")
+    if len(credential_ids) > MAX_BATCH_SIZE:
+        raise HTTPError(413, f"At most {MAX_BATCH_SIZE} credential_ids per request")
+    if len(credential_ids) >= THREAD_BATCH_SIZE:
+        results = await asyncio.to_thread(verify_by_ids, credential_ids)
+    else:
+        results = verify_by_ids(credential_ids)
+    return {"results": [_jsonable(result) for result in results]}
+
+
+# (method, path) -> (handler, requires API key)
+ROUTES = {
+    ("GET", "/healthz"): (health, False),
+    ("GET", "/metrics"): (metrics, False),
+    ("POST", "/v1/verify"): (verify, True),
+    ("POST", "/v1/verify/batch"): (verify_batch, True),
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Open the store and load the ledger before the first request
+            await asyncio.to_thread(get_store)
+            await asyncio.to_thread(get_ledger)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+# ASGI entry point
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    try:
+        route = ROUTES.get((scope["method"], scope["path"]))
+        if route is None:
+            raise HTTPError(404, "Not found")
+        handler, needs_key = route
+        payload = await _read_json(receive) if scope["method"] == "POST" else {}
+        if needs_key and not _authorized(_api_key(scope, payload)):
+            raise HTTPError(401, "Invalid or missing API key")
+        result = await handler(payload)
+        if isinstance(result, str):
+            await _send_text(send, 200, result, PROMETHEUS_CONTENT_TYPE)
+        else:
+            await _send_json(send, 200, result)
+    except HTTPError as e:
+        await _send_json(send, e.status, {"error": e.message})
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "api:app",
+        host=os.environ.get("API_HOST", "127.0.0.1"),
+        port=int(os.environ.get("API_PORT", "8000")),
+        workers=int(os.environ.get("API_WORKERS", "1")),
+        timeout_keep_alive=30,
+        access_log=False,
+    )
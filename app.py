@@ -1,9 +1,35 @@
 import streamlit as st
 import pandas as pd
-import hashlib
 import datetime
-import time
 import io
+import time
+
+from verification import (
+    certificates_zip,
+    count_institutions,
+    GROUPS,
+    fingerprint_upload,
+    get_stats,
+    get_timings,
+    image_preview,
+    list_institutions,
+    perceptual_hash_upload,
+    profiled,
+    issue_credential,
+    issue_credentials_bulk,
+    read_credential_ids,
+    read_roster,
+    recent_activity,
+    recent_revocations,
+    register_institution,
+    review_institution,
+    revoke_credential,
+    search_credentials,
+    serve_metrics,
+    verify_batch,
+    verify_by_id,
+    verify_document,
+)
 
 # Page configuration
 st.set_page_config(
@@ -13,18 +39,42 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Generate blockchain-like hash
-def generate_blockchain_hash(data):
-    return hashlib.sha256(str(data).encode()).hexdigest()[:12] + "..."
+# Shared read-only data is handed to every session as-is; under copy-on-write
+# (always on from pandas 3) a session that modifies a frame gets its own copy
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Dashboard aggregates, built once for all sessions and refreshed every few seconds
+@st.cache_resource(ttl=5)
+def load_dashboard_stats():
+    stats = get_stats().snapshot()
+    for name in GROUPS:
+        stats[name] = pd.DataFrame(stats[name], columns=[name, "Credentials"]).set_index(name)
+    return stats
+
+# signature_valid from the verification core -> display text
+SIGNATURE_LABELS = {True: "Valid", False: "Invalid", None: "Unsigned (issued before signing)"}
+
+# cProfile report for a request made with profiling on (see the Metrics page)
+def show_profile(capture):
+    if capture:
+        with st.expander("🔬 Request Profile"):
+            st.code(capture.text(), language="text")
 
 # Main application
 def main():
+    # Prometheus text on 127.0.0.1:METRICS_PORT, started once per process
+    serve_metrics()
+    
     # Sidebar navigation
     with st.sidebar:
         st.title("AcademicVerify")
         st.subheader("Credential Verification System")
         
-        menu = st.selectbox("Navigation", ["Dashboard", "Verify Credential", "Institution Portal", "About"])
+        pages = ["Dashboard", "Verify Credential", "Institution Portal", "About"]
+        if st.query_params.get("metrics") == "1":
+            pages.append("Metrics")
+        menu = st.selectbox("Navigation", pages, key="menu")
         st.markdown("---")
         st.info("Blockchain-secured academic credential verification")
         st.markdown("---")
@@ -34,142 +84,213 @@ def main():
     if menu == "Dashboard":
         st.header("📊 Verification Dashboard")
         
+        stats = load_dashboard_stats()
+        
         # Stats cards
         col1, col2, col3 = st.columns(3)
-        col1.metric("Credentials Verified", "1,842", "12% increase")
-        col2.metric("Institutions", "127", "3 new")
-        col3.metric("Success Rate", "98.7%")
+        col1.metric("Credentials Verified", f"{stats['verified']:,}")
+        col2.metric("Institutions", f"{stats['institutions']:,}")
+        col3.metric("Success Rate", f"{stats['success_rate']:.1%}" if stats['success_rate'] is not None else "—")
         
         st.markdown("---")
         
         # Recent activities
         st.subheader("Recent Activities")
-        activities = {
-            'Timestamp': [
-                datetime.datetime.now() - datetime.timedelta(hours=4),
-                datetime.datetime.now() - datetime.timedelta(hours=3),
-                datetime.datetime.now() - datetime.timedelta(hours=2),
-                datetime.datetime.now() - datetime.timedelta(hours=1),
-                datetime.datetime.now()
-            ],
-            'Activity': [
-                'Document uploaded', 
-                'Institution verified', 
-                'Verification completed', 
-                'New institution added', 
-                'Report generated'
-            ],
-            'Status': ['Completed'] * 5
-        }
-        st.dataframe(pd.DataFrame(activities), hide_index=True)
+        activities = pd.DataFrame(recent_activity(5), columns=["Timestamp", "Activity", "Subject", "Status"])
+        st.dataframe(activities, hide_index=True)
         
         # Verification metrics
         st.subheader("Verification Metrics")
         col1, col2 = st.columns(2)
         with col1:
             st.write("**By Country**")
-            country_data = pd.DataFrame({
-                'Country': ['USA', 'UK', 'Canada', 'Australia'],
-                'Credentials': [850, 420, 320, 150]
-            })
-            st.bar_chart(country_data.set_index('Country'))
+            st.bar_chart(stats["Country"])
         
         with col2:
             st.write("**By Degree**")
-            degree_data = pd.DataFrame({
-                'Degree': ['BSc Computer Science', 'MBA', 'PhD Physics', 'BA Economics'],
-                'Credentials': [420, 380, 250, 210]
-            })
-            st.bar_chart(degree_data.set_index('Degree'))
+            st.bar_chart(stats["Degree"])
                 
     # Verify Credential
     elif menu == "Verify Credential":
         st.header("🔍 Verify Academic Credential")
         
-        tab1, tab2 = st.tabs(["Verify by Document", "Verify by ID"])
+        tab1, tab2, tab3, tab4 = st.tabs(["Verify by Document", "Verify by ID", "Batch Verify", "Search"])
         
         with tab1:
             uploaded_file = st.file_uploader("Upload academic document (PDF or image)", type=["pdf", "jpg", "jpeg", "png"])
             
-            if uploaded_file:
+            # Images are checked and downscaled once; reruns reuse the cached preview
+            preview, upload_error = None, None
+            if uploaded_file and uploaded_file.type != "application/pdf":
+                try:
+                    preview = image_preview(uploaded_file)
+                except ValueError as e:
+                    upload_error = str(e)
+            
+            if upload_error:
+                st.error(f"❌ {upload_error}")
+            elif uploaded_file:
                 # Document preview
                 if uploaded_file.type == "application/pdf":
                     st.info("PDF document uploaded successfully")
                 else:
-                    st.image(uploaded_file, width=300)
+                    st.image(preview, width=300)
+                
+                # Document fingerprint
+                document_hash = fingerprint_upload(uploaded_file)
+                st.caption(f"SHA-256: `{document_hash}`")
                 
                 # Verification process
                 if st.button("Start Verification"):
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    steps = [
-                        "Uploading document...",
-                        "Extracting content...",
-                        "Verifying authenticity...",
-                        "Checking records...",
-                        "Validating blockchain...",
-                        "Finalizing..."
-                    ]
+                    def show_progress(completed, total, label):
+                        progress_bar.progress(completed / total)
+                        status_text.info(f"⏳ {label}")
                     
-                    for i, step in enumerate(steps):
-                        progress_bar.progress((i + 1) / len(steps))
-                        status_text.info(f"⏳ {step}")
-                        time.sleep(0.3)
+                    with profiled(st.session_state.get("profiling", False)) as capture:
+                        result = verify_document(uploaded_file, on_progress=show_progress)
+                    show_profile(capture)
+                    status_text.empty()
+                    record = result["record"]
                     
-                    st.success("✅ Verification Complete!")
+                    if result["tamper_suspected"]:
+                        credential_id, distance = result["tamper_match"]
+                        st.warning(f"⚠️ Possible altered copy: resembles the document issued for {credential_id} "
+                                   f"({distance} of 64 fingerprint bits differ) but is not identical to it")
                     
-                    # Verification report
-                    verification_data = {
-                        "Credential ID": "CRED-004",
-                        "Institution": "Tech University",
-                        "Student": "Sarah Williams",
-                        "Degree": "BSc Computer Science",
-                        "Issue Date": "2023-06-15",
-                        "Blockchain Hash": generate_blockchain_hash("CRED-004"),
-                    }
+                    if result["revocation"]:
+                        st.error(f"⛔ Credential revoked on {result['revocation']['Revoked']}: "
+                                 f"{result['revocation']['Reason'] or 'no reason given'}")
                     
-                    st.subheader("Verification Report")
-                    for key, value in verification_data.items():
-                        st.write(f"**{key}**: {value}")
+                    if record:
+                        if result["verified"]:
+                            st.success("✅ Verification Complete!")
+                        else:
+                            st.error("❌ Verification Failed: the document does not match a valid issued credential")
+                        
+                        # Verification report
+                        verification_data = {
+                            "Credential ID": record["Credential ID"],
+                            "Institution": record["Institution"],
+                            "Student": record["Student Name"],
+                            "Degree": record["Degree"],
+                            "Issue Date": record["Issue Date"],
+                            "Blockchain Hash": record["Blockchain Hash"],
+                            "Document Hash": result["document_hash"],
+                        }
+                        
+                        st.subheader("Verification Report")
+                        for key, value in verification_data.items():
+                            st.write(f"**{key}**: {value}")
+                        
+                        if result["ledger_valid"]:
+                            st.success("Blockchain Verification: Valid")
+                        else:
+                            st.error("Blockchain Verification: No ledger entry")
+                        
+                        if result["signature_valid"]:
+                            st.success("Digital Signature: Valid")
+                        elif result["signature_valid"] is None:
+                            st.info("Digital Signature: Issued before signing was introduced")
+                        else:
+                            st.error("Digital Signature: Invalid")
+                        
+                        if result["authentic"]:
+                            st.success("Document Integrity: Matches issued record")
+                        else:
+                            st.warning("Document Integrity: No issued record with this fingerprint")
+                    else:
+                        st.error("❌ No issued credential matches this document")
+                        st.json(result["fields"])
                     
-                    st.success("Blockchain Verification: Valid")
+                    if result["extraction_error"]:
+                        st.warning(result["extraction_error"])
+                    elif result["cached"]:
+                        st.caption("Document verified earlier; result served from cache")
+                    elif result["page_timings"]:
+                        extraction_ms = sum(page["ms"] for page in result["page_timings"])
+                        st.caption(f"Extracted {len(result['page_timings'])} page(s) in {extraction_ms:.0f} ms")
         
         with tab2:
             credential_id = st.text_input("Enter Credential ID")
             
             if st.button("Check Status"):
                 if credential_id:
-                    # Sample credentials database
-                    credentials = {
-                        "CRED-001": {
-                            "Student": "John Smith",
-                            "Degree": "BSc Computer Science",
-                            "Status": "Verified"
-                        },
-                        "CRED-002": {
-                            "Student": "Emma Johnson",
-                            "Degree": "PhD Physics",
-                            "Status": "Verified"
-                        }
-                    }
+                    with profiled(st.session_state.get("profiling", False)) as capture:
+                        result = verify_by_id(credential_id)
+                    cred = result["credential"]
+                    show_profile(capture)
                     
-                    if credential_id in credentials:
-                        cred = credentials[credential_id]
+                    if result["revocation"]:
+                        st.error(f"⛔ Credential revoked on {result['revocation']['Revoked']}: "
+                                 f"{result['revocation']['Reason'] or 'no reason given'}")
+                    elif cred:
                         st.success(f"✅ Credential Found: {cred['Degree']}")
-                        st.write(f"**Student**: {cred['Student']}")
-                        st.write(f"**Status**: {cred['Status']}")
+                        st.write(f"**Student**: {cred['Student Name']}")
+                        st.write(f"**Status**: {cred['Verification Status']}")
+                        st.write(f"**Ledger Proof**: {'Valid' if result['ledger_valid'] else 'Not anchored'}")
+                        st.write(f"**Signature**: {SIGNATURE_LABELS[result['signature_valid']]}")
                         st.write(f"**Last Verified**: {datetime.date.today()}")
                     else:
                         st.error("❌ Credential ID not found")
                 else:
                     st.warning("Please enter a Credential ID")
+
+        with tab3:
+            batch_file = st.file_uploader("Upload a CSV or Parquet file of Credential IDs", type=["csv", "parquet"])
+            
+            if batch_file and st.button("Verify Batch"):
+                try:
+                    ids = read_credential_ids(batch_file)
+                except ImportError:
+                    st.error("Parquet support requires pyarrow to be installed")
+                    ids = None
+                
+                if ids is not None:
+                    report, elapsed = verify_batch(ids)
+                    
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("IDs Checked", f"{len(report):,}")
+                    col2.metric("Found", f"{int(report['Found'].sum()):,}")
+                    col3.metric("Throughput", f"{len(report) / max(elapsed, 1e-6):,.0f} IDs/sec")
+                    
+                    st.dataframe(report.head(100), hide_index=True)
+                    st.download_button(
+                        label="📄 Download Verification Report",
+                        data=report.to_csv(index=False).encode(),
+                        file_name="verification_report.csv",
+                        mime="text/csv"
+                    )
+        
+        with tab4:
+            query = st.text_input("Student Name, Institution or Degree")
+            
+            if st.button("Search"):
+                if query.strip():
+                    start = time.perf_counter()
+                    matches = search_credentials(query, limit=20)
+                    elapsed = time.perf_counter() - start
+                    
+                    if matches:
+                        st.dataframe(pd.DataFrame([
+                            {**record.to_dict(), "Match": f"{score:.0%}"} for record, score in matches
+                        ])[["Match", "Credential ID", "Student Name", "Institution", "Degree", "Issue Date", "Verification Status"]],
+                            hide_index=True)
+                        st.caption(f"{len(matches)} candidates in {elapsed * 1000:.1f} ms — verify a candidate by its Credential ID")
+                    else:
+                        st.error("❌ No matching credentials")
+                else:
+                    st.warning("Please enter a student name or institution")
     
     # Institution Portal
     elif menu == "Institution Portal":
         st.header("🏫 Institution Portal")
         
-        tab1, tab2 = st.tabs(["Register", "Manage Credentials"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(
+            ["Register", "Manage Credentials", "Bulk Issuance", "Review Queue", "Revocation"]
+        )
         
         with tab1:
             name = st.text_input("Institution Name")
@@ -177,29 +298,166 @@ def main():
             email = st.text_input("Contact Email")
             
             if st.button("Submit Registration"):
-                st.success("Registration submitted successfully!")
-                st.info("Verification team will review your application")
-                
-                st.json({
-                    "Institution ID": f"INST-{hashlib.sha256(name.encode()).hexdigest()[:6]}",
-                    "Name": name,
-                    "Status": "Pending"
-                })
+                try:
+                    institution = register_institution(name, country, email)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.success("Registration submitted successfully!")
+                    st.info("Verification team will review your application")
+                    
+                    st.json({
+                        "Institution ID": institution["Institution ID"],
+                        "Name": name,
+                        "Status": institution["Status"],
+                        "Signing Public Key": institution["Public Key"]
+                    })
         
         with tab2:
             student_name = st.text_input("Student Name")
+            institution = st.text_input("Institution", help="Registered institution name or Institution ID")
+            issuing_country = st.selectbox("Issuing Country", ["USA", "UK", "Canada", "Other"])
             degree = st.text_input("Degree Awarded")
             issue_date = st.date_input("Issue Date")
+            document = st.file_uploader("Credential Document (optional)", type=["pdf", "jpg", "jpeg", "png"])
             
             if st.button("Issue Credential"):
-                cred_id = f"CRED-{hashlib.sha256(student_name.encode()).hexdigest()[:6]}"
-                st.success("🎓 Credential Issued!")
-                st.json({
-                    "Credential ID": cred_id,
-                    "Student": student_name,
-                    "Degree": degree,
-                    "Issue Date": issue_date.strftime("%Y-%m-%d")
-                })
+                try:
+                    record = issue_credential(
+                        student_name, institution, degree, issue_date.strftime("%Y-%m-%d"),
+                        document_hash=fingerprint_upload(document) if document else None,
+                        country=issuing_country,
+                        perceptual_hash=perceptual_hash_upload(document) if document else None
+                    )
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.success("🎓 Credential Issued!")
+                    st.json({
+                        "Credential ID": record["Credential ID"],
+                        "Student": student_name,
+                        "Degree": degree,
+                        "Issue Date": record["Issue Date"],
+                        "Blockchain Hash": record["Blockchain Hash"]
+                    })
+
+        with tab3:
+            roster_file = st.file_uploader("Upload graduation roster (CSV or Parquet)", type=["csv", "parquet"])
+            st.caption("Required columns: Student Name, Institution, Degree, Issue Date. "
+                       "Institutions must be registered and approved.")
+            
+            if roster_file and st.button("Issue Credentials"):
+                try:
+                    roster = read_roster(roster_file)
+                    issued, rejected, timings = issue_credentials_bulk(roster)
+                except (ValueError, ImportError) as e:
+                    st.error(f"❌ {e}")
+                else:
+                    elapsed = sum(timings.values())
+                    
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Credentials Issued", f"{len(issued):,}")
+                    col2.metric("Duplicates Skipped", f"{len(roster) - len(issued) - len(rejected):,}")
+                    col3.metric("Throughput", f"{len(roster) / max(elapsed, 1e-6):,.0f} records/sec")
+                    
+                    if len(rejected):
+                        st.warning(f"⚠️ {len(rejected):,} roster rows were not issued")
+                        st.dataframe(rejected[["Row", "Error", "Student Name", "Institution", "Degree", "Issue Date"]],
+                                     hide_index=True)
+                    
+                    st.dataframe(
+                        pd.DataFrame({"Stage": list(timings), "Seconds": [round(t, 3) for t in timings.values()]}),
+                        hide_index=True
+                    )
+                    st.download_button(
+                        label="📄 Download Issued Credentials",
+                        data=issued.to_csv(index=False).encode(),
+                        file_name="issued_credentials.csv",
+                        mime="text/csv"
+                    )
+                    if len(issued):
+                        # Rendered only when clicked, streamed into the archive one chunk at a time
+                        st.download_button(
+                            label="🎓 Download Certificates (ZIP)",
+                            data=lambda records=issued.to_dict("records"): certificates_zip(records).read(),
+                            file_name="certificates.zip",
+                            mime="application/zip",
+                            on_click="ignore"
+                        )
+
+        with tab4:
+            registry_status = st.selectbox("Status", ["Pending", "Approved", "Rejected", "All"])
+            status_filter = None if registry_status == "All" else registry_status
+            
+            # Keyset pagination: the after_id of every page visited, per status
+            cursors = st.session_state.setdefault(f"registry_pages_{registry_status}", [""])
+            page, next_after = list_institutions(status_filter, after_id=cursors[-1])
+            st.caption(f"{count_institutions(status_filter):,} institutions · page {len(cursors)}")
+            st.dataframe(
+                pd.DataFrame(page, columns=["Institution ID", "Name", "Country", "Contact Email", "Status", "Registered"]),
+                hide_index=True
+            )
+            
+            col1, col2 = st.columns(2)
+            if col1.button("◀ Previous Page", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+            if col2.button("Next Page ▶", disabled=next_after is None):
+                cursors.append(next_after)
+                st.rerun()
+            
+            if status_filter == "Pending" and page:
+                application = st.selectbox(
+                    "Application", page, format_func=lambda i: f"{i['Name']} ({i['Institution ID']})"
+                )
+                col1, col2 = st.columns(2)
+                if col1.button("✅ Approve"):
+                    review_institution(application["Institution ID"], approve=True)
+                    st.rerun()
+                if col2.button("❌ Reject"):
+                    review_institution(application["Institution ID"], approve=False)
+                    st.rerun()
+
+        with tab5:
+            with st.form("revoke_credential"):
+                revoke_id = st.text_input("Credential ID")
+                revoke_reason = st.text_input("Reason")
+                
+                if st.form_submit_button("Revoke Credential"):
+                    if not revoke_id:
+                        st.warning("Please enter a Credential ID")
+                    else:
+                        try:
+                            revoke_credential(revoke_id.strip(), revoke_reason.strip() or None)
+                        except ValueError as e:
+                            st.error(f"❌ {e}")
+                        else:
+                            st.success(f"✅ Credential {revoke_id.strip()} revoked")
+            
+            st.subheader("Recent Revocations")
+            st.dataframe(pd.DataFrame(recent_revocations(), columns=["Credential ID", "Reason", "Revoked"]),
+                         hide_index=True)
+    
+    # Metrics (hidden; open the app with ?metrics=1)
+    elif menu == "Metrics":
+        st.header("📈 Metrics")
+        st.caption("Stage latencies recorded by this server process over its most recent requests")
+        
+        summary = pd.DataFrame(
+            get_timings().summary(), columns=["Stage", "Count", "Mean ms", "p50 ms", "p95 ms", "p99 ms"]
+        )
+        if summary.empty:
+            st.info("No requests timed yet")
+        else:
+            st.dataframe(summary.round(2), hide_index=True)
+        
+        st.session_state.profiling = st.toggle(
+            "Profile my requests", value=st.session_state.get("profiling", False),
+            help="Verifications made in this session show a cProfile report while this is on"
+        )
+        
+        with st.expander("Prometheus Exposition"):
+            st.code(get_timings().prometheus(), language="text")
     
     # About
     elif menu == "About":
@@ -209,8 +467,9 @@ def main():
         st.subheader("Our Technology")
         col1, col2, col3 = st.columns(3)
         col1.metric("Blockchain Nodes", "24")
-        col2.metric("Institutions", "127")
-        col3.metric("Credentials", "18,429")
+        stats = load_dashboard_stats()
+        col2.metric("Institutions", f"{stats['institutions']:,}")
+        col3.metric("Credentials", f"{stats['credentials']:,}")
         
         st.subheader("Contact")
         st.write("📧 support@academicverify.com  \n🌐 www.academicverify.com  \n🏢 Matatiele, Ha Maloto, 4730")
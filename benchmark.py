@@ -0,0 +1,225 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Every file the benchmark writes lives here, including the audit log and
+# the signing keystore, whose paths are read when verification is imported
+WORKDIR = tempfile.mkdtemp(prefix="credential-bench-")
+os.environ["AUDIT_LOG"] = os.path.join(WORKDIR, "audit.log")
+os.environ["CREDENTIAL_KEYSTORE"] = os.path.join(WORKDIR, "signing_keys.db")
+
+from verification import issue_credentials_bulk, verify_batch, verify_by_id
+from verification.audit import get_audit_log
+from verification.hashing import hash_stream
+from verification.ledger import Ledger
+from verification.search import SearchIndex
+from verification.stats import DashboardStats
+from verification.store import CredentialStore
+
+# Building blocks for synthetic records, in the spirit of the demo seed data
+FIRST_NAMES = ["John", "Emma", "Michael", "Sarah", "David", "Olivia", "James", "Amara", "Thabo", "Lerato"]
+LAST_NAMES = ["Smith", "Johnson", "Brown", "Williams", "Jones", "Nkosi", "Dlamini", "Garcia", "Miller", "Davis"]
+INSTITUTIONS = [
+    ("Tech University", "USA"), ("Science Institute", "UK"), ("Global College", "Canada"),
+    ("Metropolitan University", "Australia"), ("Polytechnic Institute", "Germany"),
+]
+DEGREES = ["BSc Computer Science", "MBA", "PhD Physics", "BA Economics", "MEng Civil Engineering"]
+STATUSES = ["Verified"] * 9 + ["Pending"]
+
+# Rows written to the ledger are capped; a 10M-row ledger is not a latency benchmark
+LEDGER_ROW_LIMIT = 1_000_000
+INSERT_CHUNK = 100_000
+
+
+def synthetic_id(i):
+    return f"CRED-{i:012d}"
+
+
+# Synthetic credential rows in store column order, produced in chunks
+def generate_credentials(count, seed=0):
+    rng = random.Random(seed)
+    for start in range(0, count, INSERT_CHUNK):
+        rows = []
+        for i in range(start, min(start + INSERT_CHUNK, count)):
+            institution, country = rng.choice(INSTITUTIONS)
+            rows.append((
+                synthetic_id(i),
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+                institution,
+                rng.choice(DEGREES),
+                f"{rng.randint(2000, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                rng.choice(STATUSES),
+                None,
+                None,
+                country,
+            ))
+        yield rows
+
+
+def populate(store, ledger, count):
+    anchored = 0
+    for rows in generate_credentials(count):
+        if anchored < LEDGER_ROW_LIMIT:
+            records = [dict(zip(["Credential ID", "Student Name", "Institution", "Degree", "Issue Date"], row))
+                       for row in rows]
+            leaves = ledger.append_many(records)
+            rows = [row[:6] + (leaf,) + row[7:] for row, leaf in zip(rows, leaves)]
+            anchored += len(rows)
+        store.add_many(rows)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_table(rows, iterations, workdir):
+    store = CredentialStore(os.path.join(workdir, f"bench_{rows}.db"))
+    ledger = Ledger(os.path.join(workdir, f"bench_{rows}.jsonl"))
+    rng = random.Random(1)
+
+    start = time.perf_counter()
+    populate(store, ledger, rows)
+    results = {"populate_seconds": time.perf_counter() - start}
+
+    ids = [synthetic_id(rng.randrange(rows)) for _ in range(iterations)]
+    lookup_ids = iter(ids)
+    results["id_lookup"] = percentiles(timed(lambda: store.get(next(lookup_ids)), iterations))
+
+    verify_ids = iter(ids)
+    results["verify_by_id"] = percentiles(
+        timed(lambda: verify_by_id(next(verify_ids), store=store, ledger=ledger), iterations)
+    )
+
+    index = SearchIndex(store)
+    start = time.perf_counter()
+    index.search("")
+    results["search_index_build_seconds"] = time.perf_counter() - start
+    queries = iter([
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[:-1]} {rng.choice(INSTITUTIONS)[0]}"
+        for _ in range(iterations)
+    ])
+    results["fuzzy_search"] = percentiles(timed(lambda: index.search(next(queries)), iterations))
+
+    batch = pd.Series([synthetic_id(rng.randrange(rows * 2)) for _ in range(10_000)])
+    results["batch_verification_10k"] = percentiles(
+        timed(lambda: verify_batch(batch, store=store), max(1, iterations // 100))
+    )
+
+    batches = iter(range(max(1, iterations // 100)))
+
+    def issue_batch():
+        n = next(batches)
+        roster = pd.DataFrame({
+            "Student Name": [f"Bench Student {rows}-{n}-{i}" for i in range(5_000)],
+            "Institution": "Tech University",
+            "Degree": "BSc Computer Science",
+            "Issue Date": "2024-06-15",
+        })
+        issue_credentials_bulk(roster, store=store, ledger=ledger)
+
+    results["bulk_issuance_5k"] = percentiles(timed(issue_batch, max(1, iterations // 100)))
+
+    results["dashboard_cold_aggregation"] = percentiles(timed(lambda: DashboardStats(store), 3))
+    stats = DashboardStats(store)
+    results["dashboard_snapshot"] = percentiles(timed(stats.snapshot, iterations))
+
+    store.close()
+    ledger.close()
+    return results
+
+
+def bench_hashing(sizes_mb, iterations):
+    results = {}
+    for size in sizes_mb:
+        payload = os.urandom(size << 20)
+        results[f"document_hash_{size}mb"] = percentiles(
+            timed(lambda: hash_stream(io.BytesIO(payload)), iterations)
+        )
+    return results
+
+
+# Flag every metric whose p95 grew by more than the tolerance
+def compare(current, baseline, tolerance):
+    regressions = []
+    for group, metrics in current["results"].items():
+        for name, value in metrics.items():
+            before = baseline.get("results", {}).get(group, {}).get(name)
+            if isinstance(value, dict) and isinstance(before, dict):
+                if value["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                    regressions.append(f"{group}/{name}: p95 {before['p95_ms']:.3f} -> {value['p95_ms']:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lookup, issuance, hashing and dashboard aggregation")
+    parser.add_argument("--rows", default="10000",
+                        help="comma-separated table sizes, e.g. 10000,1000000,10000000")
+    parser.add_argument("--iterations", type=int, default=1000, help="samples per latency metric")
+    parser.add_argument("--hash-sizes", default="1,10,50", help="document sizes in MB")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON to check for p95 regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth before failing")
+    args = parser.parse_args()
+
+    try:
+        results = {}
+        for rows in (int(n) for n in args.rows.split(",")):
+            results[f"table_{rows}"] = bench_table(rows, args.iterations, WORKDIR)
+        results["hashing"] = bench_hashing([int(n) for n in args.hash_sizes.split(",")], 10)
+    finally:
+        get_audit_log().flush()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import io
+from functools import lru_cache
+
+STATUS_COLORS = {"Verified": "#4CAF50", "Pending": "#FFC107"}
+OTHER_STATUS_COLOR = "#F44336"
+
+
+def _status_color(status):
+    return STATUS_COLORS.get(status, OTHER_STATUS_COLOR)
+
+
+# Native Vega-Lite chart; rendered in the browser, nothing kept server-side
+def status_chart_altair(status_counts):
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame({"Status": list(status_counts.index), "Count": list(status_counts.values)})
+    return alt.Chart(data, title="Verification Status Distribution").mark_bar().encode(
+        x=alt.X("Count:Q"),
+        y=alt.Y("Status:N", sort="-x", title=None),
+        color=alt.Color(
+            "Status:N",
+            scale=alt.Scale(domain=data["Status"].tolist(), range=[_status_color(s) for s in data["Status"]]),
+            legend=None,
+        ),
+    ).properties(height=150)
+
+
+# Matplotlib rendering memoized by the counts themselves. Uses a standalone
+# Figure (no pyplot registry), so nothing outlives the call.
+@lru_cache(maxsize=64)
+def _status_chart_png(items):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    statuses = [status for status, _ in items]
+    fig = Figure(figsize=(6, 3))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.barh(statuses, [count for _, count in items], color=[_status_color(s) for s in statuses])
+    ax.set_xlabel("Count")
+    ax.set_title("Verification Status Distribution")
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    fig.clear()
+    return buffer.getvalue()
+
+
+def status_chart_png(status_counts):
+    return _status_chart_png(tuple(zip(status_counts.index, (int(v) for v in status_counts.values))))
+
+
+# Prefer the Altair path; fall back to a cached PNG when Altair is unavailable
+def show_status_chart(container, status_counts):
+    try:
+        container.altair_chart(status_chart_altair(status_counts), use_container_width=True)
+    except ImportError:
+        container.image(status_chart_png(status_counts))
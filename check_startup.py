@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Cold-start import budget (milliseconds, cumulative) for the Streamlit entry
+# points, in the order the apps import them. Modules already loaded by an
+# earlier entry are not counted again, matching a real cold start.
+BUDGET_MS = {
+    "streamlit": 2000,
+    "pandas": 800,
+    "verification": 150,
+    "charts": 20,
+}
+TOTAL_BUDGET_MS = 3000
+
+# Heavy libraries that must only load on the pages that use them
+LAZY_MODULES = ["matplotlib", "altair", "PIL", "seaborn"]
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# Import every module in a fresh interpreter with -X importtime
+def measure():
+    code = "import sys; " + "; ".join(f"import {name}" for name in BUDGET_MS) + (
+        "; print(','.join(m for m in %r if m in sys.modules))" % LAZY_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports are the unindented entries
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() in BUDGET_MS:
+            timings[name.strip()] = int(cumulative) / 1000
+    eager = [name for name in result.stdout.strip().split(",") if name]
+    return timings, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budget of the Streamlit apps")
+    parser.add_argument("--json", action="store_true", help="emit results as JSON")
+    args = parser.parse_args()
+
+    timings, eager = measure()
+    total = sum(timings.values())
+    over = {name: ms for name, ms in timings.items() if ms > BUDGET_MS[name]}
+    ok = not over and not eager and total <= TOTAL_BUDGET_MS
+
+    if args.json:
+        print(json.dumps({
+            "modules_ms": timings,
+            "total_ms": total,
+            "budget_ms": BUDGET_MS,
+            "total_budget_ms": TOTAL_BUDGET_MS,
+            "eager_heavy_modules": eager,
+            "ok": ok,
+        }, indent=2))
+    else:
+        for name, ms in timings.items():
+            flag = "  OVER" if name in over else ""
+            print(f"{name:<24}{ms:>9.1f} ms  (budget {BUDGET_MS[name]} ms){flag}")
+        print(f"{'total':<24}{total:>9.1f} ms  (budget {TOTAL_BUDGET_MS} ms)")
+        if eager:
+            print(f"Heavy modules loaded at startup: {', '.join(eager)}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
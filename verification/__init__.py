@@ -0,0 +1,58 @@
+from .audit import recent_activity
+from .batch import read_credential_ids, verify_batch
+from .cache import get_result_cache
+from .certificates import certificates_zip, render_certificate
+from .fraud import perceptual_hash_upload
+from .hashing import fingerprint_upload
+from .images import image_preview
+from .institutions import (
+    count_institutions,
+    list_institutions,
+    pending_institutions,
+    register_institution,
+    review_institution,
+)
+from .issuance import issue_credential, issue_credentials_bulk, read_roster
+from .ledger import get_ledger
+from .lookup import verify_by_id, verify_by_ids
+from .metrics import get_timings, profiled, serve_metrics
+from .pipeline import verify_document
+from .records import Credential
+from .revocation import recent_revocations, revoke_credential
+from .search import search_credentials
+from .stats import GROUPS, get_stats
+from .store import get_store
+
+__all__ = [
+    "Credential",
+    "GROUPS",
+    "certificates_zip",
+    "count_institutions",
+    "fingerprint_upload",
+    "get_ledger",
+    "get_result_cache",
+    "get_stats",
+    "image_preview",
+    "get_store",
+    "get_timings",
+    "issue_credential",
+    "issue_credentials_bulk",
+    "list_institutions",
+    "pending_institutions",
+    "perceptual_hash_upload",
+    "profiled",
+    "read_credential_ids",
+    "read_roster",
+    "recent_activity",
+    "recent_revocations",
+    "register_institution",
+    "render_certificate",
+    "review_institution",
+    "revoke_credential",
+    "search_credentials",
+    "serve_metrics",
+    "verify_batch",
+    "verify_by_id",
+    "verify_by_ids",
+    "verify_document",
+]
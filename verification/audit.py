@@ -0,0 +1,170 @@
+import atexit
+import datetime
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+
+# Audit log location (override with AUDIT_LOG)
+AUDIT_PATH = os.environ.get(
+    "AUDIT_LOG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audit.log")
+)
+
+# The live file is rotated to audit.log.1 once it passes MAX_BYTES; older
+# files shift up and anything beyond BACKUP_COUNT is dropped
+MAX_BYTES = 10 << 20
+BACKUP_COUNT = 5
+
+
+# Append-only JSON-lines event log. record() only enqueues; a background
+# thread drains the queue and writes each batch with a single append, so
+# request threads never wait on the disk.
+class AuditLog:
+    def __init__(self, path=AUDIT_PATH, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._writer = None
+        atexit.register(self.flush)
+
+    def record(self, activity, status="Completed", subject=None):
+        if self._writer is None:
+            self._start()
+        self._queue.put((time.time(), activity, status, subject))
+
+    def _start(self):
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._writer.start()
+
+    # Block until everything recorded so far is on disk
+    def flush(self):
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout=5)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [item for item in batch if not isinstance(item, threading.Event)]
+            if events:
+                try:
+                    self._write(events)
+                except OSError:
+                    pass
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    # Append a batch, rotating whenever the live file would pass max_bytes
+    def _write(self, events):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        pending = []
+        for ts, activity, status, subject in events:
+            line = json.dumps(
+                {"ts": ts, "activity": activity, "status": status, "subject": subject},
+                separators=(",", ":"),
+            ).encode() + b"\n"
+            if size and size + len(line) > self.max_bytes:
+                self._append(pending)
+                self._rotate()
+                pending, size = [], 0
+            pending.append(line)
+            size += len(line)
+        self._append(pending)
+
+    def _append(self, lines):
+        if lines:
+            with open(self.path, "ab", buffering=0) as log:
+                log.write(b"".join(lines))
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    # Newest `limit` events, newest first. Each file is memory-mapped and
+    # scanned backwards from its end, so only the lines returned are read;
+    # older rotated files are consulted only if the live one runs short.
+    def tail(self, limit=10):
+        events = []
+        for index in range(self.backup_count + 1):
+            path = f"{self.path}.{index}" if index else self.path
+            events += _tail_lines(path, limit - len(events))
+            if len(events) >= limit:
+                break
+        return events
+
+
+# Up to `limit` decoded lines from the end of one log file, newest first
+def _tail_lines(path, limit):
+    try:
+        log = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with log:
+        size = os.fstat(log.fileno()).st_size
+        if not size or limit <= 0:
+            return []
+        with mmap.mmap(log.fileno(), size, access=mmap.ACCESS_READ) as view:
+            # A trailing line without its newline is still being written
+            end = view.rfind(b"\n") + 1
+            lines = []
+            while end > 0 and len(lines) < limit:
+                start = view.rfind(b"\n", 0, end - 1) + 1
+                try:
+                    lines.append(json.loads(view[start:end - 1]))
+                except ValueError:
+                    pass
+                end = start
+            return lines
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_audit_log(path=None):
+    path = path or AUDIT_PATH
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = AuditLog(path)
+        return _logs[path]
+
+
+def record_event(activity, status="Completed", subject=None):
+    get_audit_log().record(activity, status, subject)
+
+
+# Latest events as display rows for the dashboard, newest first
+def recent_activity(limit=10):
+    return [
+        {
+            "Timestamp": datetime.datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "Activity": event["activity"],
+            "Subject": event.get("subject") or "",
+            "Status": event["status"],
+        }
+        for event in get_audit_log().tail(limit)
+    ]
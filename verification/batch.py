@@ -0,0 +1,41 @@
+import time
+
+import pandas as pd
+
+from .lookup import verify_by_ids
+from .records import COLUMNS
+
+ID_COLUMN = "Credential ID"
+
+
+# Read credential IDs from an uploaded CSV or Parquet file
+def read_credential_ids(uploaded_file):
+    if uploaded_file.name.lower().endswith(".parquet"):
+        df = pd.read_parquet(uploaded_file)
+    else:
+        df = pd.read_csv(uploaded_file, dtype=str)
+    column = ID_COLUMN if ID_COLUMN in df.columns else df.columns[0]
+    return df[column].astype(str).str.strip()
+
+
+# Verify every ID through the same core as the API (store, ledger proof,
+# signature, revocation and result cache) and lay the results out as a report
+def verify_batch(ids, store=None, ledger=None):
+    start = time.perf_counter()
+
+    results = verify_by_ids(list(ids), store, ledger)
+    report = pd.DataFrame(
+        [result["credential"].to_dict() if result["found"] else {} for result in results],
+        columns=list(COLUMNS),
+    )
+    report[ID_COLUMN] = [result["credential_id"] for result in results]
+    report["Found"] = [result["found"] for result in results]
+    report["Ledger Valid"] = [result["ledger_valid"] for result in results]
+    report["Signature Valid"] = [result["signature_valid"] for result in results]
+    report["Revoked"] = [result["revocation"] is not None for result in results]
+    report["Verification Status"] = report["Verification Status"].fillna("Not Found")
+    report.loc[report["Revoked"], "Verification Status"] = "Revoked"
+
+    elapsed = time.perf_counter() - start
+    return report, elapsed
+
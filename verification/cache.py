@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+
+from .store import get_store
+
+# Bounded by entry count and age; other processes' writes show up within the TTL
+CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", "300"))
+
+
+# LRU cache of verification results with a per-entry TTL. Each entry carries
+# tags (credential IDs, document hashes) so a write can drop every result
+# that depended on the records it touched.
+class ResultCache:
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._counters = Counter(hits=0, misses=0, evictions=0, expirations=0, invalidations=0)
+
+    def _drop(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    # Cached value for key, or None on a miss or an expired entry
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if entry[1] <= time.monotonic():
+                self._drop(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[0]
+
+    def put(self, key, value, tags=()):
+        tags = frozenset(tag for tag in tags if tag)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    # Drop every entry tagged with any of the given credential IDs or hashes
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self._counters["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    # Counters plus current size, for tuning CACHE_SIZE and CACHE_TTL
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hit_rate": self._counters["hits"] / lookups if lookups else None,
+            }
+
+
+# Tags for every result that may depend on these records
+def record_tags(records):
+    tags = set()
+    for record in records:
+        tags.add(record.get("Credential ID"))
+        tags.add(record.get("Document Hash"))
+    tags.discard(None)
+    return tags
+
+
+_caches = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+# One result cache per store, shared by every session
+def get_result_cache(store=None):
+    store = store or get_store()
+    with _caches_lock:
+        if store not in _caches:
+            _caches[store] = ResultCache()
+        return _caches[store]
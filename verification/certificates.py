@@ -0,0 +1,203 @@
+import datetime
+import itertools
+import json
+import os
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from .metrics import span
+
+# A4 landscape, in PDF points
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595
+QR_X, QR_Y, QR_SIZE = 610, 215, 170
+QR_MASK = 0
+# ZIP archives are kept in memory up to this size, then spill to disk
+SPOOL_SIZE = 16 << 20
+# Batches at least this large are rendered in a process pool, a chunk at a time
+PARALLEL_THRESHOLD = 1_000
+RENDER_CHUNK_SIZE = 250
+
+# (label, record field, baseline y) for the detail rows
+DETAIL_ROWS = [
+    ("Student Name", "Student Name", 410),
+    ("Institution", "Institution", 382),
+    ("Degree", "Degree", 354),
+    ("Issue Date", "Issue Date", 326),
+    ("Credential ID", "Credential ID", 298),
+    ("Status", "Verification Status", 270),
+]
+VALUE_X = 210
+
+# Fonts referenced by the content streams; the standard 14 need no embedding
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold", "F3": "Courier"}
+
+
+def _escape(text):
+    text = str(text).encode("cp1252", errors="replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text(font, size, x, y, text):
+    return f"BT /{font} {size} Tf {x} {y} Td ({_escape(text)}) Tj ET\n"
+
+
+def _object(number, body):
+    return f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+
+def _stream(data):
+    data = zlib.compress(data)
+    return f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode() + data + b"\nendstream"
+
+
+# Static page furniture: borders, title, labels and footer
+def _template_content():
+    parts = [
+        "0.12 0.23 0.54 RG 3 w 30 30 782 535 re S\n",
+        "0.6 0.65 0.75 RG 1 w 40 40 762 515 re S\n",
+        "0.12 0.23 0.54 rg\n",
+        _text("F2", 26, 70, 500, "Credential Verification Certificate"),
+        "0.3 0.3 0.3 rg\n",
+        _text("F1", 12, 70, 476, "AcademicVerify - blockchain-anchored academic credentials"),
+    ]
+    parts += [_text("F2", 12, 70, y, label) for label, _, y in DETAIL_ROWS]
+    parts += [
+        _text("F2", 12, 70, 242, "Verified On"),
+        _text("F2", 12, 70, 196, "Ledger Hash"),
+        _text("F1", 9, QR_X, QR_Y - 16, "Scan to verify this credential"),
+        _text("F1", 9, 70, 70, "Submit the Credential ID to the verification API to confirm this certificate "
+                               "against the institutional record and its ledger proof."),
+    ]
+    return "".join(parts).encode("latin-1")
+
+
+# Every object except the per-certificate content stream (object 7), built
+# once; returns the bytes plus the xref offset of each object
+@lru_cache(maxsize=1)
+def _template():
+    fonts = " ".join(f"/{name} {number} 0 R" for name, number in zip(FONTS, (5, 6, 8)))
+    bodies = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        3: (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << {fonts} >> >> /Contents [4 0 R 7 0 R] >>").encode(),
+        4: _stream(_template_content()),
+    }
+    for number, font in zip((5, 6, 8), FONTS.values()):
+        bodies[number] = f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>".encode()
+
+    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+    for number, body in bodies.items():
+        offsets[number] = len(pdf)
+        pdf += _object(number, body)
+    return bytes(pdf), offsets
+
+
+# Dark QR modules as filled rectangles, one per horizontal run. The mask is
+# fixed: scoring all eight masks is most of qrcode's cost and scanners read
+# any of them.
+def _qr_content(payload):
+    import qrcode
+
+    qr = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M, mask_pattern=QR_MASK)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    module = QR_SIZE / len(matrix)
+
+    parts = ["0 0 0 rg\n"]
+    for row, cells in enumerate(matrix):
+        y = QR_Y + QR_SIZE - (row + 1) * module
+        column = 0
+        while column < len(cells):
+            if not cells[column]:
+                column += 1
+                continue
+            start = column
+            while column < len(cells) and cells[column]:
+                column += 1
+            parts.append(f"{QR_X + start * module:.2f} {y:.2f} {(column - start) * module:.2f} {module:.2f} re\n")
+    parts.append("f\n")
+    return "".join(parts)
+
+
+# QR payload: the same body the verification API's POST /v1/verify accepts,
+# plus the ledger hash so a scanner can check it offline
+def qr_payload(record):
+    return json.dumps(
+        {"credential_id": record["Credential ID"], "blockchain_hash": record["Blockchain Hash"]},
+        separators=(",", ":"),
+    )
+
+
+# One-page PDF certificate for a credential record
+def render_certificate(record, verified_on=None):
+    with span("certificate_render"):
+        return _render_certificate(record, verified_on)
+
+
+def _render_certificate(record, verified_on):
+    verified_on = verified_on or datetime.date.today().strftime("%Y-%m-%d")
+    parts = ["0 0 0 rg\n"]
+    parts += [_text("F1", 12, VALUE_X, y, record[field] or "-") for _, field, y in DETAIL_ROWS]
+    parts.append(_text("F1", 12, VALUE_X, 242, verified_on))
+    parts.append(_text("F3", 9, 70, 180, record["Blockchain Hash"] or "Not anchored"))
+    parts.append(_qr_content(qr_payload(record)))
+
+    template, offsets = _template()
+    pdf = bytearray(template)
+    offsets = {**offsets, 7: len(pdf)}
+    pdf += _object(7, _stream("".join(parts).encode("latin-1")))
+
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode()
+    for number in sorted(offsets):
+        pdf += f"{offsets[number]:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+# Worker: (file name, PDF) pairs for one chunk of records
+def _render_chunk(records, verified_on):
+    return [(f"{record['Credential ID']}.pdf", render_certificate(record, verified_on)) for record in records]
+
+
+def _rendered(records, verified_on):
+    head = list(itertools.islice(records, PARALLEL_THRESHOLD))
+    if len(head) < PARALLEL_THRESHOLD:
+        yield from _render_chunk(head, verified_on)
+        return
+
+    # Large batch: keep at most a few chunks in flight per worker
+    records = itertools.chain(head, records)
+    chunks = iter(lambda: list(itertools.islice(records, RENDER_CHUNK_SIZE)), [])
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(itertools.islice(chunks, workers * 2))
+            if not batch:
+                return
+            for rendered in pool.map(_render_chunk, batch, itertools.repeat(verified_on)):
+                yield from rendered
+
+
+# Stream certificates for many records into a ZIP archive as they are
+# rendered; only the chunks in flight are held in memory
+def write_certificates_zip(records, fileobj, verified_on=None):
+    verified_on = verified_on or datetime.date.today().strftime("%Y-%m-%d")
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, pdf in _rendered(iter(records), verified_on):
+            archive.writestr(name, pdf)
+    return fileobj
+
+
+# ZIP of certificates in a spooled temporary file, rewound for reading
+def certificates_zip(records, verified_on=None):
+    fileobj = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    write_certificates_zip(records, fileobj, verified_on)
+    fileobj.seek(0)
+    return fileobj
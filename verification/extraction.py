@@ -0,0 +1,98 @@
+import atexit
+import io
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Field name -> patterns tried in order; the first capture group is the value
+FIELD_PATTERNS = {
+    "Credential ID": [re.compile(r"\b(CRED-[0-9A-Z]{3,26})\b")],
+    "Student Name": [
+        re.compile(r"Student(?: Full)? Name\s*[:\-]\s*(.+)", re.IGNORECASE),
+        re.compile(r"certif(?:y|ies) that\s+(.+?)\s+(?:has|having)\b", re.IGNORECASE),
+    ],
+    "Institution": [
+        re.compile(r"Institution\s*[:\-]\s*(.+)", re.IGNORECASE),
+        re.compile(r"^\s*((?:[A-Z][\w&'.-]* )*(?:University|College|Institute|Polytechnic)(?: of [A-Z][\w ]+)?)\s*$",
+                   re.MULTILINE),
+    ],
+    "Degree": [
+        re.compile(r"Degree(?: Awarded)?\s*[:\-]\s*(.+)", re.IGNORECASE),
+        re.compile(r"\b((?:Bachelor|Master|Doctor)\s+of\s+[A-Z][\w ]+|(?:BSc|BA|BEng|MSc|MA|MEng|MBA|PhD)\s+[A-Z][\w ]+)"),
+    ],
+}
+
+MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Fill any still-missing fields from one page of text
+def parse_fields(text, fields):
+    for name, patterns in FIELD_PATTERNS.items():
+        if name in fields:
+            continue
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                fields[name] = match.group(1).strip()
+                break
+    return fields
+
+
+# Text of each PDF page, read one page at a time
+def _pdf_pages(data):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+# OCR text of an image, normalized and size-checked before tesseract sees it
+def _image_pages(data):
+    import pytesseract
+
+    from .images import normalize_image
+
+    yield pytesseract.image_to_string(normalize_image(data))
+
+
+# Worker: parse a document page by page, stopping once every field is found.
+# Returns the fields plus per-page timings in milliseconds.
+def extract_fields(data, mime_type):
+    pages = _pdf_pages(data) if mime_type == "application/pdf" else _image_pages(data)
+    fields, timings = {}, []
+    start = time.perf_counter()
+    try:
+        for number, text in enumerate(pages, start=1):
+            parse_fields(text, fields)
+            now = time.perf_counter()
+            timings.append({"page": number, "ms": (now - start) * 1000})
+            start = now
+            if len(fields) == len(FIELD_PATTERNS):
+                break
+    except ImportError as e:
+        return {}, [], f"Extraction unavailable: {e.name} is not installed"
+    except Exception as e:
+        return fields, timings, f"Extraction failed: {e}"
+    return fields, timings, None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+                atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+
+# Run extraction for an upload in the shared process pool, off the GIL
+def extract_document(uploaded_file):
+    data = uploaded_file.getvalue()
+    return _get_pool().submit(extract_fields, data, uploaded_file.type).result()
@@ -0,0 +1,132 @@
+import itertools
+import threading
+import weakref
+
+from .store import get_store
+
+HASH_BITS = 64
+# Uploads within this many differing bits of an issued document are near matches
+MAX_DISTANCE = 10
+# Multi-index hashing: the hash is split into this many 16-bit substrings
+SUBSTRINGS = 4
+SUBSTRING_BITS = HASH_BITS // SUBSTRINGS
+
+
+# 64-bit difference hash (dHash): each bit says whether a pixel is brighter
+# than its right-hand neighbour in a 9x8 grayscale thumbnail. Re-encoding,
+# rescaling and small edits flip few bits; a different document flips many.
+def perceptual_hash(data):
+    from PIL import Image
+
+    from .images import normalize_image
+
+    image = normalize_image(data, max_edge=256).convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(image.getdata())
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return value
+
+
+# Hex perceptual hash of an image upload, or None for PDFs
+def perceptual_hash_upload(uploaded_file):
+    if uploaded_file.type == "application/pdf":
+        return None
+    return f"{perceptual_hash(uploaded_file.getvalue()):016x}"
+
+
+# XOR masks flipping up to `radius` bits of one substring
+def _flip_masks(radius):
+    masks = []
+    for flips in range(radius + 1):
+        for bits in itertools.combinations(range(SUBSTRING_BITS), flips):
+            masks.append(sum(1 << bit for bit in bits))
+    return masks
+
+
+# Multi-index hash table over Hamming distance. Every hash is filed under each
+# of its substrings; if two hashes are within r bits, by pigeonhole at least
+# one substring is within r // SUBSTRINGS bits, so a search only probes those
+# few buckets and checks the full distance of what it finds there.
+class MultiIndexHash:
+    def __init__(self):
+        self._tables = [{} for _ in range(SUBSTRINGS)]
+        self._masks = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _substrings(self, value):
+        mask = (1 << SUBSTRING_BITS) - 1
+        return [(value >> (i * SUBSTRING_BITS)) & mask for i in range(SUBSTRINGS)]
+
+    def add(self, value, item):
+        self._size += 1
+        entry = (value, item)
+        for table, key in zip(self._tables, self._substrings(value)):
+            table.setdefault(key, []).append(entry)
+
+    # (distance, item) pairs within max_distance, nearest first
+    def search(self, value, max_distance):
+        radius = max_distance // SUBSTRINGS
+        if radius not in self._masks:
+            self._masks[radius] = _flip_masks(radius)
+        matches = {}
+        for table, key in zip(self._tables, self._substrings(value)):
+            for flip in self._masks[radius]:
+                for candidate, item in table.get(key ^ flip, ()):
+                    distance = (candidate ^ value).bit_count()
+                    if distance <= max_distance:
+                        matches[item] = distance
+        return sorted((distance, item) for item, distance in matches.items())
+
+
+# Multi-index table of issued-document perceptual hashes for one store,
+# loaded on the first lookup and kept current by the issuance paths
+class FingerprintIndex:
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._table = MultiIndexHash()
+        self._built = False
+
+    def _build(self):
+        with self._lock:
+            if self._built:
+                return
+            for credential_id, value in self._store.iter_perceptual_hashes():
+                self._table.add(int(value, 16), credential_id)
+            self._built = True
+
+    def add(self, records):
+        with self._lock:
+            if not self._built:
+                return
+            for record in records:
+                if record.get("Perceptual Hash"):
+                    self._table.add(int(record["Perceptual Hash"], 16), record["Credential ID"])
+
+    def __len__(self):
+        return len(self._table)
+
+    # [(credential_id, distance)] for issued documents near this hash
+    def near_matches(self, value, max_distance=MAX_DISTANCE):
+        self._build()
+        with self._lock:
+            matches = self._table.search(value, max_distance)
+        return [(credential_id, distance) for distance, credential_id in matches]
+
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+# One fingerprint index per store, shared by every session
+def get_fingerprint_index(store=None):
+    store = store or get_store()
+    with _indexes_lock:
+        if store not in _indexes:
+            _indexes[store] = FingerprintIndex(store)
+        return _indexes[store]
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import get_timings
+
+# 1 MiB reads keep memory flat even for 50 MB scans
+CHUNK_SIZE = 1 << 20
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# Stream a binary file object through SHA-256 in fixed-size chunks; time
+# spent reading and hashing is recorded as separate stages
+def hash_stream(stream, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    start = time.perf_counter()
+    read_seconds = 0.0
+    while True:
+        read_start = time.perf_counter()
+        chunk = stream.read(chunk_size)
+        read_seconds += time.perf_counter() - read_start
+        if not chunk:
+            break
+        digest.update(chunk)
+    timings = get_timings()
+    timings.observe("upload_read", read_seconds)
+    timings.observe("hashing", time.perf_counter() - start - read_seconds)
+    return digest.hexdigest()
+
+
+# Identity of a Streamlit upload, stable across reruns
+def upload_key(uploaded_file):
+    file_id = getattr(uploaded_file, "file_id", None) or getattr(uploaded_file, "id", None)
+    return (file_id, uploaded_file.name, uploaded_file.size)
+
+
+# Full SHA-256 hex digest of an upload, cached so reruns don't rehash
+def fingerprint_upload(uploaded_file):
+    key = upload_key(uploaded_file)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    position = uploaded_file.tell()
+    uploaded_file.seek(0)
+    try:
+        digest = hash_stream(uploaded_file)
+    finally:
+        uploaded_file.seek(position)
+
+    with _cache_lock:
+        _cache[key] = digest
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return digest
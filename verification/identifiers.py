@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+# Crockford base32: no I, L, O or U
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+RANDOM_BITS = 80
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+# Time-ordered 128-bit IDs (ULID layout): 48-bit millisecond timestamp followed
+# by 80 random bits. Within one millisecond the random part is incremented, so
+# IDs from a process are strictly increasing and never repeat.
+class IdGenerator:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new(self):
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms <= self._last_ms:
+                ms = self._last_ms
+                self._last_random += 1
+                if self._last_random >> RANDOM_BITS:
+                    ms += 1
+                    self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+            else:
+                self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+            self._last_ms = ms
+            random_part = self._last_random
+        return _encode(ms, 10) + _encode(random_part, 16)
+
+
+_generator = IdGenerator()
+
+
+def new_institution_id():
+    return f"INST-{_generator.new()}"
+
+
+# Credential IDs are checked against the store's primary-key index and redrawn
+# on the (astronomically unlikely) clash, so each ID costs one indexed probe.
+def new_credential_ids(count, store):
+    ids = [f"CRED-{_generator.new()}" for _ in range(count)]
+    clashes = {row[0] for row in store.get_many(ids)}
+    while clashes:
+        ids = [f"CRED-{_generator.new()}" if i in clashes else i for i in ids]
+        clashes = {row[0] for row in store.get_many(ids)}
+    return ids
+
+
+def new_credential_id(store):
+    return new_credential_ids(1, store)[0]
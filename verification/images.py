@@ -0,0 +1,87 @@
+import io
+import threading
+from collections import OrderedDict
+
+from .hashing import fingerprint_upload
+from .metrics import span
+
+# Uploads outside these limits are rejected before anything decodes them
+MAX_IMAGE_BYTES = 20 << 20
+MAX_IMAGE_PIXELS = 50_000_000
+# Formats accepted as credential scans; MPO is what many phones write for JPEG
+ACCEPTED_FORMATS = {"JPEG", "MPO", "PNG"}
+
+# Images are normalized to RGB with this longest edge before extraction
+MAX_EDGE = 3000
+PREVIEW_WIDTH = 300
+PREVIEW_CACHE_SIZE = 64
+
+_previews = OrderedDict()
+_previews_lock = threading.Lock()
+
+
+# Decode an upload after checking its size, format and pixel count
+def open_image(data):
+    from PIL import Image
+
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ValueError(f"Image is larger than {MAX_IMAGE_BYTES >> 20} MB")
+    try:
+        image = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError:
+        raise ValueError(f"Image is larger than {MAX_IMAGE_PIXELS // 1_000_000} megapixels")
+    except OSError:
+        raise ValueError("File is not a readable image")
+    if image.format not in ACCEPTED_FORMATS:
+        raise ValueError(f"Unsupported image format: {image.format}")
+    if image.width * image.height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Image is larger than {MAX_IMAGE_PIXELS // 1_000_000} megapixels")
+    return image
+
+
+# Upright RGB image no larger than max_edge on its longest side. JPEG draft
+# mode lets the decoder skip detail that the resize would throw away.
+# Pixel data is only decoded here, so truncated files fail here too.
+def normalize_image(data, max_edge=MAX_EDGE):
+    from PIL import Image, ImageOps
+
+    image = open_image(data)
+    try:
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_edge, max_edge))
+    except Image.DecompressionBombError:
+        raise ValueError(f"Image is larger than {MAX_IMAGE_PIXELS // 1_000_000} megapixels")
+    except OSError:
+        raise ValueError("File is not a readable or complete image")
+    return image
+
+
+def _render_preview(data):
+    image = normalize_image(data, max_edge=PREVIEW_WIDTH * 2)
+    image.thumbnail((PREVIEW_WIDTH, PREVIEW_WIDTH * 2))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+# Small JPEG preview of an image upload, cached by document digest so reruns
+# and other sessions never decode or ship the full-size original again.
+# Raises ValueError for uploads that fail the checks in open_image.
+def image_preview(uploaded_file):
+    key = fingerprint_upload(uploaded_file)
+    with _previews_lock:
+        if key in _previews:
+            _previews.move_to_end(key)
+            return _previews[key]
+
+    with span("preview_render"):
+        preview = _render_preview(uploaded_file.getvalue())
+
+    with _previews_lock:
+        _previews[key] = preview
+        if len(_previews) > PREVIEW_CACHE_SIZE:
+            _previews.popitem(last=False)
+    return preview
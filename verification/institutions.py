@@ -0,0 +1,80 @@
+from .audit import record_event
+from .identifiers import new_institution_id
+from .signatures import institution_key
+from .store import get_store
+
+STATUSES = ("Pending", "Approved", "Rejected")
+PAGE_SIZE = 50
+
+
+# New institution application, persisted in the registry as Pending. Its
+# Ed25519 signing keypair is created here; credentials it issues are signed
+# with that key once the application is approved.
+def register_institution(name, country, contact_email=None, store=None):
+    name = (name or "").strip()
+    if not name:
+        raise ValueError("Institution name is required")
+    store = store or get_store()
+    institution = store.add_institution(new_institution_id(), name, country, contact_email or None)
+    institution_key(institution["Institution ID"], store)
+    institution["Public Key"] = store.public_keys([institution["Institution ID"]])[institution["Institution ID"]].hex()
+    record_event("Institution registered", "Pending", institution["Institution ID"])
+    return institution
+
+
+# Approve or reject a pending application; returns False if it was not pending
+def review_institution(institution_id, approve, store=None):
+    store = store or get_store()
+    status = "Approved" if approve else "Rejected"
+    reviewed = store.review_institution(institution_id, status)
+    if reviewed:
+        record_event("Institution reviewed", status, institution_id)
+    return reviewed
+
+
+# One page of the registry plus the ID to pass as after_id for the next page
+# (None on the last page)
+def list_institutions(status=None, after_id="", limit=PAGE_SIZE, store=None):
+    store = store or get_store()
+    page = store.list_institutions(status, after_id, limit + 1)
+    next_after = page[limit - 1]["Institution ID"] if len(page) > limit else None
+    return page[:limit], next_after
+
+
+def count_institutions(status=None, store=None):
+    store = store or get_store()
+    return store.count_institutions(status)
+
+
+# Oldest pending applications first
+def pending_institutions(limit=PAGE_SIZE, store=None):
+    return list_institutions("Pending", limit=limit, store=store)[0]
+
+
+# Registered institution (or None) for each name or Institution ID given;
+# blank and non-string values are never registered
+def find_institutions(values, store=None):
+    store = store or get_store()
+    values = {value for value in values if isinstance(value, str) and value.strip()}
+    ids = [value for value in values if value.startswith("INST-")]
+    found = {value: store.get_institution(value) for value in ids}
+    found.update(store.institutions_by_name(values.difference(ids)))
+    return {value: found.get(value) for value in values}
+
+
+# Registered institutions for a set of names or Institution IDs, keyed by the
+# value given. Raises ValueError for blank, unknown or unapproved institutions.
+def resolve_institutions(values, store=None):
+    values = set(values)
+    resolved = find_institutions(values, store)
+    if len(resolved) < len(values):
+        raise ValueError("Institution is required")
+
+    unknown = sorted(value for value in values if not resolved[value])
+    if unknown:
+        raise ValueError(f"Unregistered institution: {', '.join(unknown)}")
+    unapproved = sorted(f"{value} ({resolved[value]['Status']})" for value in values
+                        if resolved[value]["Status"] != "Approved")
+    if unapproved:
+        raise ValueError(f"Institution not approved to issue credentials: {', '.join(unapproved)}")
+    return resolved
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+
+# Keystore location (override with CREDENTIAL_KEYSTORE). Signing keys are kept
+# out of the credential database, so write access to the records is not
+# enough to re-sign an edited credential.
+KEYSTORE_PATH = os.environ.get(
+    "CREDENTIAL_KEYSTORE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "signing_keys.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signing_keys (
+    institution_id TEXT PRIMARY KEY,
+    private_key    BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+# Institution Ed25519 private keys, in their own SQLite file readable by the owner only
+class KeyStore:
+    def __init__(self, path=KEYSTORE_PATH):
+        self.path = path
+        # SQLite gives its -wal and -shm files the same permissions
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def signing_key(self, institution_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT private_key FROM signing_keys WHERE institution_id = ?", (institution_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    # Keeps the first key stored for an institution and returns the stored
+    # key, so concurrent first issues agree on one key
+    def add_signing_key(self, institution_id, private_key):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO signing_keys (institution_id, private_key) VALUES (?, ?)",
+                (institution_id, private_key)
+            )
+            return self._conn.execute(
+                "SELECT private_key FROM signing_keys WHERE institution_id = ?", (institution_id,)
+            ).fetchone()[0]
+
+    # (institution_id, private_key) rows moved over from an older credential database
+    def import_keys(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO signing_keys (institution_id, private_key) VALUES (?, ?)", rows
+            )
+
+    def rename(self, old_id, new_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE OR IGNORE signing_keys SET institution_id = ? WHERE institution_id = ?", (new_id, old_id)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_keystore = None
+_keystore_lock = threading.Lock()
+
+
+# One keystore per process, shared by every session
+def get_keystore():
+    global _keystore
+    if _keystore is None:
+        with _keystore_lock:
+            if _keystore is None:
+                _keystore = KeyStore()
+    return _keystore
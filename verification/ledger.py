@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are then only serialised within this process
+    fcntl = None
+
+# Ledger location (override with CREDENTIAL_LEDGER)
+LEDGER_PATH = os.environ.get(
+    "CREDENTIAL_LEDGER",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ledger.jsonl")
+)
+
+BLOCK_SIZE = 1024
+TREE_CACHE_SIZE = 64
+GENESIS_HASH = "0" * 64
+
+# Credential fields committed to by a ledger leaf
+LEAF_FIELDS = ("Credential ID", "Student Name", "Institution", "Degree", "Issue Date", "Document Hash")
+
+
+# Leaf hash of a credential record (0x00 prefix separates leaves from nodes)
+def leaf_hash(record):
+    payload = json.dumps([record.get(field) for field in LEAF_FIELDS], separators=(",", ":"))
+    return hashlib.sha256(b"\x00" + payload.encode()).hexdigest()
+
+
+def _node_hash(left, right):
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+# Hash one tree level into the next; an odd trailing node is promoted unchanged
+def _next_level(level):
+    parents = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(leaves):
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+# Every level of the tree, leaves first
+def merkle_levels(leaves):
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        levels.append(_next_level(levels[-1]))
+    return levels
+
+
+# Sibling path for a leaf as (sibling_hash, sibling_is_left) pairs
+def proof_from_levels(levels, index):
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], sibling < index))
+        index //= 2
+    return proof
+
+
+def merkle_proof(leaves, index):
+    return proof_from_levels(merkle_levels(leaves), index)
+
+
+# O(log n) inclusion check
+def verify_proof(leaf, proof, root):
+    current = leaf
+    for sibling, sibling_is_left in proof:
+        current = _node_hash(sibling, current) if sibling_is_left else _node_hash(current, sibling)
+    return current == root
+
+
+# Advisory lock on the ledger file, shared by every process that writes it
+@contextmanager
+def _file_lock(file, exclusive):
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _block_hash(header):
+    payload = json.dumps(
+        [header["index"], header["prev_hash"], header["merkle_root"], header["timestamp"], header["size"]],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Append-only, hash-chained ledger of credential blocks stored as JSON lines
+class Ledger:
+    def __init__(self, path=LEDGER_PATH, block_size=BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = []
+        self._index = {}
+        self._trees = OrderedDict()
+        self._offset = 0
+        # Single appends waiting for the next group commit, as [record, leaf, error] entries
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._file = open(path, "ab")
+        with self._lock:
+            self._catch_up()
+
+    # Load blocks appended since the last read, including ones written by
+    # other processes (e.g. the API server reading what the UI issued).
+    # Callers hold self._lock; the file lock keeps writers out meanwhile.
+    def _catch_up(self, locked=False):
+        if os.path.getsize(self.path) <= self._offset:
+            return
+        with open(self.path, "rb") as f:
+            if locked:
+                data = self._read_from(f)
+            else:
+                with _file_lock(f, exclusive=False):
+                    data = self._read_from(f)
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                block = json.loads(line)
+                if block["index"] != len(self._blocks):
+                    raise ValueError(
+                        f"Ledger block {block['index']} is out of sequence (expected {len(self._blocks)})"
+                    )
+                self._load_block(block)
+        self._offset += end
+
+    def _read_from(self, f):
+        f.seek(self._offset)
+        return f.read()
+
+    def _load_block(self, block):
+        for position, credential_id in enumerate(block["credential_ids"]):
+            self._index[credential_id] = (block["index"], position)
+        self._blocks.append(block)
+
+    @property
+    def tip(self):
+        return self._blocks[-1]["hash"] if self._blocks else GENESIS_HASH
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, credential_id):
+        return credential_id in self._index
+
+    # Seal records into blocks of up to block_size leaves with a single fsync.
+    # Returns the leaf hash for each record; precomputed leaves may be passed in.
+    # Each block stores its inner tree levels, so any proof costs O(log n)
+    # without rehashing the block's leaves.
+    def append_many(self, records, leaves=None):
+        if leaves is None:
+            leaves = [leaf_hash(record) for record in records]
+        credential_ids = [record["Credential ID"] for record in records]
+
+        with self._lock, _file_lock(self._file, exclusive=True):
+            # Re-read the tail under the file lock so the new blocks chain
+            # onto whatever other processes appended; a partial line left by
+            # a crashed writer is cut off rather than written after
+            self._catch_up(locked=True)
+            if os.path.getsize(self.path) > self._offset:
+                self._file.truncate(self._offset)
+            lines = []
+            for start in range(0, len(leaves), self.block_size):
+                block_leaves = leaves[start:start + self.block_size]
+                levels = merkle_levels(block_leaves)
+                block = {
+                    "index": len(self._blocks),
+                    "prev_hash": self.tip,
+                    "merkle_root": levels[-1][0],
+                    "timestamp": time.time(),
+                    "size": len(block_leaves),
+                }
+                block["hash"] = _block_hash(block)
+                block["credential_ids"] = credential_ids[start:start + self.block_size]
+                block["leaves"] = block_leaves
+                block["levels"] = levels[1:-1]
+                self._load_block(block)
+                lines.append(json.dumps(block, separators=(",", ":")) + "\n")
+
+            data = "".join(lines).encode()
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._offset = os.fstat(self._file.fileno()).st_size
+        return leaves
+
+    # Anchor one record. Concurrent callers are group-committed: whoever
+    # takes the commit lock seals every record queued so far into shared
+    # blocks with one fsync, and the rest find theirs already written.
+    # Appends from other processes are still committed separately.
+    def append(self, record, leaf=None):
+        entry = [record, leaf or leaf_hash(record), None]
+        with self._pending_lock:
+            self._pending.append(entry)
+        with self._commit_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                try:
+                    self.append_many([queued[0] for queued in batch], leaves=[queued[1] for queued in batch])
+                except Exception as e:
+                    for queued in batch:
+                        queued[2] = e
+        if entry[2] is not None:
+            raise entry[2]
+        return entry[1]
+
+    # Tree levels of a block. Blocks sealed before levels were stored are
+    # rebuilt from their leaves and kept in a small LRU.
+    def _levels(self, block):
+        if "levels" in block:
+            levels = [block["leaves"], *block["levels"]]
+            if len(levels[-1]) > 1:
+                levels.append([block["merkle_root"]])
+            return levels
+        with self._lock:
+            levels = self._trees.get(block["index"])
+            if levels is not None:
+                self._trees.move_to_end(block["index"])
+                return levels
+        levels = merkle_levels(block["leaves"])
+        with self._lock:
+            self._trees[block["index"]] = levels
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return levels
+
+    # Inclusion proof for a credential, or None when it was never anchored
+    def proof(self, credential_id):
+        with self._lock:
+            location = self._index.get(credential_id)
+            if location is None:
+                self._catch_up()
+                location = self._index.get(credential_id)
+            if location is None:
+                return None
+            block = self._blocks[location[0]]
+        return {
+            "block": block["index"],
+            "block_hash": block["hash"],
+            "merkle_root": block["merkle_root"],
+            "leaf": block["leaves"][location[1]],
+            "path": proof_from_levels(self._levels(block), location[1]),
+        }
+
+    # The record's current fields must hash to a leaf included under its block root
+    def verify(self, record):
+        proof = self.proof(record["Credential ID"])
+        if proof is None:
+            return False
+        leaf = leaf_hash(record)
+        return leaf == proof["leaf"] and verify_proof(leaf, proof["path"], proof["merkle_root"])
+
+    # Full O(n) audit of block hashes, chain links and Merkle roots
+    def verify_chain(self):
+        prev_hash = GENESIS_HASH
+        with self._lock:
+            for block in self._blocks:
+                if block["prev_hash"] != prev_hash or block["hash"] != _block_hash(block):
+                    return False
+                levels = merkle_levels(block["leaves"])
+                if block["merkle_root"] != levels[-1][0]:
+                    return False
+                if "levels" in block and block["levels"] != levels[1:-1]:
+                    return False
+                prev_hash = block["hash"]
+        return True
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+# One ledger per process, shared by every session
+def get_ledger():
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = Ledger()
+    return _ledger
@@ -0,0 +1,103 @@
+from .audit import record_event
+from .cache import get_result_cache
+from .ledger import get_ledger
+from .metrics import span
+from .records import Credential
+from .revocation import get_revocations
+from .signatures import verify_signatures
+from .stats import get_stats
+from .store import get_store
+
+
+def _result(credential_id, record, ledger_valid, signature_valid, revocation):
+    return {
+        "credential_id": credential_id,
+        "found": record is not None,
+        "credential": record,
+        "ledger_valid": ledger_valid,
+        "signature_valid": signature_valid,
+        "revocation": revocation,
+    }
+
+
+# Check and cache (record, ledger_valid, signature_valid) for each ID, with
+# one batched signature check; misses are cached too and dropped on issue
+def _remember(cache, records, store, ledger):
+    found = [record for record in records.values() if record is not None]
+    with span("signature_check"):
+        signatures = dict(zip((record["Credential ID"] for record in found), verify_signatures(found, store)))
+    with span("ledger_check"):
+        anchored = {record["Credential ID"]: ledger.verify(record) for record in found}
+    entries = {}
+    for credential_id, record in records.items():
+        entries[credential_id] = (
+            record,
+            anchored.get(credential_id, False),
+            signatures.get(credential_id),
+        )
+        cache.put(("id", credential_id), entries[credential_id], tags=[credential_id])
+    return entries
+
+
+# Revocation state is never cached, so a revocation made in this process
+# shows up on the next lookup and one made by another process within the
+# revocation list's SYNC_INTERVAL; the Bloom filter keeps this check cheap
+def _revocations(entries, store):
+    with span("revocation_check"):
+        return get_revocations(store).check_many(
+            [credential_id for credential_id, entry in entries.items() if entry[0] is not None]
+        )
+
+
+# Verification core shared by the Streamlit "Verify by Credential ID" path and the HTTP API
+def verify_by_id(credential_id, store=None, ledger=None):
+    with span("id_verification"):
+        return _verify_by_id(credential_id, store, ledger)
+
+
+def _verify_by_id(credential_id, store, ledger):
+    store = store or get_store()
+    ledger = ledger or get_ledger()
+
+    cache = get_result_cache(store)
+    entry = cache.get(("id", credential_id))
+    if entry is None:
+        with span("lookup"):
+            record = store.get(credential_id)
+        entry = _remember(cache, {credential_id: record}, store, ledger)[credential_id]
+    record = entry[0]
+    revocation = _revocations({credential_id: entry}, store).get(credential_id)
+    # A revoked credential is reported, but counts as a failed verification
+    valid = record is not None and revocation is None
+    get_stats(store).record_verifications(found=int(valid), not_found=int(not valid))
+    if record is None:
+        status = "Not Found"
+    else:
+        status = "Revoked" if revocation is not None else "Found"
+    record_event("Verification by ID", status, credential_id)
+    return _result(credential_id, *entry, revocation)
+
+
+# Many IDs with one batched store query; results keep the input order
+def verify_by_ids(credential_ids, store=None, ledger=None):
+    store = store or get_store()
+    ledger = ledger or get_ledger()
+
+    cache = get_result_cache(store)
+    entries = {}
+    for cid in set(credential_ids):
+        entry = cache.get(("id", cid))
+        if entry is not None:
+            entries[cid] = entry
+    misses = [cid for cid in set(credential_ids) if cid not in entries]
+    if misses:
+        with span("lookup"):
+            records = {row[0]: Credential(*row) for row in store.get_many(misses)}
+        entries.update(_remember(cache, {cid: records.get(cid) for cid in misses}, store, ledger))
+    revocations = _revocations(entries, store)
+    results = [_result(cid, *entries[cid], revocations.get(cid)) for cid in credential_ids]
+    found = sum(result["found"] for result in results)
+    valid = sum(result["found"] and result["revocation"] is None for result in results)
+    get_stats(store).record_verifications(found=valid, not_found=len(results) - valid)
+    record_event("Batch verification", f"{found:,} found", f"{len(results):,} IDs")
+    return results
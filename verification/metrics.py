@@ -0,0 +1,208 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Percentiles are computed over each stage's most recent samples
+WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_NAME = "credential_verification_stage_seconds"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Per-stage latency: running count and sum plus a window of recent samples
+class StageTimings:
+    def __init__(self, window=WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self._window)
+                self._totals[stage] = [0, 0.0]
+            self._samples[stage].append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    # {stage: (count, sum, {quantile: seconds})}
+    def snapshot(self):
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+        return {
+            stage: (*totals[stage], {q: values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES})
+            for stage, values in sorted(samples.items())
+        }
+
+    # Dashboard rows with latencies in milliseconds
+    def summary(self):
+        return [
+            {
+                "Stage": stage,
+                "Count": count,
+                "Mean ms": total / count * 1000,
+                **{f"p{round(q * 100)} ms": value * 1000 for q, value in quantiles.items()},
+            }
+            for stage, (count, total, quantiles) in self.snapshot().items()
+        ]
+
+    # Prometheus text exposition format, one summary metric labelled by stage
+    def prometheus(self):
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each verification and issuance stage.",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        for stage, (count, total, quantiles) in self.snapshot().items():
+            for q, value in quantiles.items():
+                lines.append(f'{METRIC_NAME}{{stage="{stage}",quantile="{q}"}} {value:.9f}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {total:.9f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+_timings = StageTimings()
+
+
+def get_timings():
+    return _timings
+
+
+# Time a block as one sample of `stage`
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings.observe(stage, time.perf_counter() - start)
+
+
+# cProfile stats gathered for one request, across every thread it runs on
+class ProfileCapture:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = None
+        # Thread whose profiler was started by profiled()
+        self.thread = threading.get_ident()
+
+    def add(self, profile):
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+
+    # Top functions by cumulative time
+    def text(self, limit=30):
+        with self._lock:
+            if self._stats is None:
+                return ""
+            output = io.StringIO()
+            self._stats.stream = output
+            self._stats.sort_stats("cumulative").print_stats(limit)
+            return output.getvalue()
+
+
+_capture = contextvars.ContextVar("profile_capture", default=None)
+
+
+# A started profiler, or None when another one is already active. From
+# Python 3.12 cProfile is built on sys.monitoring, which allows one profiler
+# per process and sees every thread, so the active one records this work.
+def _start_profile():
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        return None
+    return profile
+
+
+def _profile_into(capture, function, *args):
+    profile = _start_profile()
+    if profile is None:
+        return function(*args)
+    try:
+        return function(*args)
+    finally:
+        profile.disable()
+        capture.add(profile)
+
+
+# Profile the enclosed request when enabled. Before Python 3.12 cProfile only
+# sees the thread it runs on, so work handed to asyncio.to_thread goes through
+# profile_call, which picks the capture up from the copied context.
+@contextmanager
+def profiled(enabled=True):
+    if not enabled:
+        yield None
+        return
+    capture = ProfileCapture()
+    token = _capture.set(capture)
+    profile = _start_profile()
+    try:
+        yield capture
+    finally:
+        if profile is not None:
+            profile.disable()
+        _capture.reset(token)
+        if profile is not None:
+            capture.add(profile)
+
+
+# Call function(*args), profiled when this runs on behalf of a profiled
+# request; on the request's own thread its profiler is already recording
+def profile_call(function, *args):
+    capture = _capture.get()
+    if capture is None or capture.thread == threading.get_ident():
+        return function(*args)
+    return _profile_into(capture, function, *args)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = _timings.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+# Serve /metrics on 127.0.0.1:METRICS_PORT from a daemon thread, once per
+# process; does nothing when METRICS_PORT is unset or the port is taken
+def serve_metrics(port=None):
+    global _server, _server_started
+    port = port or os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+from .audit import record_event
+from .cache import get_result_cache
+from .extraction import extract_document
+from .fraud import get_fingerprint_index, perceptual_hash
+from .hashing import fingerprint_upload
+from .ledger import get_ledger
+from .metrics import get_timings, profile_call
+from .revocation import get_revocations
+from .signatures import verify_signature
+from .stats import get_stats
+from .store import get_store
+
+# Stage name -> progress label
+STAGES = {
+    "upload": "Uploading document...",
+    "extract": "Extracting document content...",
+    "authenticity": "Verifying document authenticity...",
+    "records": "Checking against institutional records...",
+    "fraud": "Screening for altered copies...",
+    "ledger": "Validating with blockchain registry...",
+    "finalize": "Finalizing verification...",
+}
+
+# Result keys reused when the same document is verified again
+CACHED_FIELDS = (
+    "fields", "page_timings", "extraction_error", "authentic", "document_match", "record", "ledger_valid",
+    "signature_valid", "near_matches", "tamper_match", "tamper_suspected", "verified",
+)
+
+
+# Stage 1: read the upload and fingerprint its bytes
+def stage_upload(ctx):
+    ctx["document_hash"] = fingerprint_upload(ctx["file"])
+    record_event("Document uploaded", subject=ctx["file"].name)
+
+
+def _file_fields(uploaded_file):
+    return {
+        "File Name": uploaded_file.name,
+        "File Type": uploaded_file.type,
+        "File Size": uploaded_file.size,
+    }
+
+
+# Stage 2: pull metadata and credential fields out of the document
+def stage_extract(ctx):
+    fields, ctx["page_timings"], ctx["extraction_error"] = extract_document(ctx["file"])
+    ctx["fields"] = {**_file_fields(ctx["file"]), **fields}
+
+
+# Stage 3: credentials issued for exactly these document bytes
+def stage_authenticity(ctx):
+    matches = ctx["store"].find_by_document_hash(ctx["document_hash"])
+    ctx["document_matches"] = {match["Credential ID"] for match in matches}
+    ctx["document_match"] = matches[0] if matches else None
+
+
+# Stage 4: look the credential up by the ID printed on the document
+def stage_records(ctx):
+    credential_id = ctx["fields"].get("Credential ID")
+    ctx["record"] = ctx["store"].get(credential_id) if credential_id else None
+
+
+# Stage 5: scans that look like an issued document, by perceptual hash, found
+# through a multi-index table instead of comparing against every stored document
+def stage_fraud(ctx):
+    ctx["near_matches"] = []
+    if ctx["file"].type == "application/pdf":
+        return
+    try:
+        value = perceptual_hash(ctx["file"].getvalue())
+    except (ImportError, ValueError, OSError):
+        return
+    ctx["near_matches"] = get_fingerprint_index(ctx["store"]).near_matches(value)
+
+
+# Stage 6: the matched record must have a valid Merkle inclusion proof,
+# a valid institution signature when signed, and must not be revoked
+def stage_ledger(ctx):
+    record = ctx["record"] or ctx["document_match"]
+    ctx["ledger_valid"] = bool(record) and ctx["ledger"].verify(record)
+    ctx["signature_valid"] = verify_signature(record, ctx["store"]) if record else None
+    ctx["revocation"] = get_revocations(ctx["store"]).check(record["Credential ID"]) if record else None
+
+
+# Audit entry for a finished document verification
+def _record_outcome(ctx):
+    record = ctx["record"]
+    if ctx["verified"]:
+        status = "Verified"
+    elif ctx["tamper_suspected"]:
+        status = "Suspected Altered Copy"
+    else:
+        status = "Not Verified"
+    record_event("Document verification", status, record["Credential ID"] if record else ctx["file"].name)
+
+
+# Stage 7: settle on the record and overall verdict. The document is
+# authentic only if its bytes were issued for that same credential, so a
+# genuine document of one credential cannot vouch for another's ID. A scan
+# that is not authentic but closely resembles an issued document, including
+# the holder's own, is a suspected altered copy; distance 0 is the same
+# image re-encoded, not an alteration.
+def stage_finalize(ctx):
+    ctx["record"] = ctx["record"] or ctx["document_match"]
+    record_id = ctx["record"]["Credential ID"] if ctx["record"] else None
+    ctx["authentic"] = record_id is not None and record_id in ctx["document_matches"]
+    ctx["tamper_match"] = None if ctx["authentic"] else next(
+        ((credential_id, distance) for credential_id, distance in ctx["near_matches"]
+         if distance > 0),
+        None,
+    )
+    ctx["tamper_suspected"] = ctx["tamper_match"] is not None
+    ctx["verified"] = bool(
+        ctx["record"] and ctx["authentic"] and ctx["ledger_valid"] and ctx["signature_valid"] is not False
+        and ctx["revocation"] is None and ctx["record"]["Verification Status"] == "Verified"
+    )
+    get_stats(ctx["store"]).record_verifications(found=int(ctx["verified"]), not_found=int(not ctx["verified"]))
+    _record_outcome(ctx)
+
+
+# Run the seven stages; authenticity, records and fraud checks run concurrently.
+# on_progress(completed, total, label) fires as each stage actually finishes.
+async def run_verification(uploaded_file, store=None, ledger=None, on_progress=None):
+    ctx = {
+        "file": uploaded_file,
+        "store": store or get_store(),
+        "ledger": ledger or get_ledger(),
+        "timings": {},
+    }
+    completed = 0
+
+    async def run(name, stage):
+        nonlocal completed
+        start = time.perf_counter()
+        await asyncio.to_thread(profile_call, stage, ctx)
+        ctx["timings"][name] = time.perf_counter() - start
+        get_timings().observe(f"document_{name}", ctx["timings"][name])
+        completed += 1
+        if on_progress:
+            on_progress(completed, len(STAGES), STAGES[name])
+
+    await run("upload", stage_upload)
+
+    # A document seen before skips extraction and every check after it
+    cache = get_result_cache(ctx["store"])
+    key = ("document", ctx["document_hash"])
+    cached = cache.get(key)
+    if cached is not None:
+        ctx.update(cached)
+        # Revocation is re-checked on every hit; it may have happened in
+        # another process since this result was cached
+        record = ctx["record"]
+        ctx["revocation"] = get_revocations(ctx["store"]).check(record["Credential ID"]) if record else None
+        ctx["verified"] = ctx["verified"] and ctx["revocation"] is None
+        ctx["fields"] = {**ctx["fields"], **_file_fields(ctx["file"])}
+        get_stats(ctx["store"]).record_verifications(
+            found=int(ctx["verified"]), not_found=int(not ctx["verified"])
+        )
+        _record_outcome(ctx)
+        if on_progress:
+            on_progress(len(STAGES), len(STAGES), STAGES["finalize"])
+        ctx["cached"] = True
+        del ctx["file"], ctx["store"], ctx["ledger"]
+        return ctx
+
+    await run("extract", stage_extract)
+    await asyncio.gather(
+        run("authenticity", stage_authenticity),
+        run("records", stage_records),
+        run("fraud", stage_fraud),
+    )
+    await run("ledger", stage_ledger)
+    await run("finalize", stage_finalize)
+
+    # Failed extractions are retried rather than cached
+    if not ctx["extraction_error"]:
+        cache.put(key, {name: ctx[name] for name in CACHED_FIELDS}, tags=[
+            ctx["document_hash"],
+            ctx["fields"].get("Credential ID"),
+            ctx["record"] and ctx["record"]["Credential ID"],
+        ])
+    ctx["cached"] = False
+
+    del ctx["file"], ctx["store"], ctx["ledger"]
+    return ctx
+
+
+# Synchronous entry point for the Streamlit script thread
+def verify_document(uploaded_file, store=None, ledger=None, on_progress=None):
+    return asyncio.run(run_verification(uploaded_file, store, ledger, on_progress))
@@ -0,0 +1,65 @@
+# Display name -> column name
+COLUMNS = {
+    "Credential ID": "credential_id",
+    "Student Name": "student_name",
+    "Institution": "institution",
+    "Degree": "degree",
+    "Issue Date": "issue_date",
+    "Verification Status": "status",
+    "Blockchain Hash": "blockchain_hash",
+    "Document Hash": "document_hash",
+    "Country": "country",
+    "Signature": "signature",
+    "Institution ID": "institution_id",
+    "Perceptual Hash": "perceptual_hash",
+}
+
+# Institution registry: display name -> column name
+INSTITUTION_COLUMNS = {
+    "Institution ID": "institution_id",
+    "Name": "name",
+    "Country": "country",
+    "Contact Email": "contact_email",
+    "Status": "status",
+    "Registered": "registered_at",
+    "Reviewed": "reviewed_at",
+}
+
+
+# Compact credential record: one slot per column, no per-instance dict.
+# Supports record["Display Name"] access so callers can treat it like the
+# dicts the UI builds.
+class Credential:
+    __slots__ = tuple(COLUMNS.values())
+
+    def __init__(self, *values):
+        for column, value in zip(self.__slots__, values):
+            setattr(self, column, value)
+        for column in self.__slots__[len(values):]:
+            setattr(self, column, None)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data.get(name) for name in COLUMNS))
+
+    def __getitem__(self, name):
+        return getattr(self, COLUMNS[name])
+
+    def __setitem__(self, name, value):
+        setattr(self, COLUMNS[name], value)
+
+    def get(self, name, default=None):
+        column = COLUMNS.get(name)
+        return getattr(self, column) if column else default
+
+    def astuple(self):
+        return tuple(getattr(self, column) for column in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, column) for name, column in COLUMNS.items()}
+
+    def __eq__(self, other):
+        return isinstance(other, Credential) and self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return f"Credential({self.credential_id!r})"
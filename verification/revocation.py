@@ -0,0 +1,120 @@
+import hashlib
+import math
+import threading
+import time
+import weakref
+
+from .audit import record_event
+from .cache import get_result_cache
+from .stats import get_stats
+from .store import get_store
+
+# False-positive rate of the in-memory filter; only positives reach the store
+ERROR_RATE = 0.001
+MIN_CAPACITY = 1024
+# Revocations made by other processes are picked up within this many seconds
+SYNC_INTERVAL = 2.0
+
+
+# Fixed-size Bloom filter over credential IDs. Positions come from one
+# BLAKE2b digest split into two 64-bit halves (double hashing).
+class BloomFilter:
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+
+# Revoked credential IDs for one store. Checks go to the Bloom filter first;
+# only possible hits cost a store query, so a non-revoked credential is
+# cleared without a database round trip.
+class RevocationList:
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(MIN_CAPACITY)
+        self._seq = 0
+        self._synced = float("-inf")
+
+    # Pull in revocations recorded since the last sync, at most every
+    # SYNC_INTERVAL seconds; the filter is rebuilt larger once it fills up
+    def _sync(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._synced < SYNC_INTERVAL:
+                return
+            self._synced = now
+            rows = self._store.revocations_since(self._seq)
+            if self._filter.count + len(rows) > self._filter.capacity:
+                self._filter = BloomFilter((self._filter.count + len(rows)) * 2)
+                rows = self._store.revocations_since(0)
+            for seq, credential_id in rows:
+                self._filter.add(credential_id)
+                self._seq = seq
+
+    def revoke(self, credential_id, reason=None):
+        record = self._store.get(credential_id)
+        if record is None:
+            raise ValueError(f"{credential_id} does not exist")
+        self._store.add_revocation(credential_id, reason)
+        self._sync(force=True)
+        get_stats(self._store).record_revoked(record["Verification Status"])
+        get_result_cache(self._store).invalidate([credential_id])
+        record_event("Credential revoked", "Revoked", credential_id)
+
+    # Credential ID -> {"Reason", "Revoked"} for the revoked IDs among these
+    def check_many(self, credential_ids):
+        self._sync()
+        with self._lock:
+            maybe = [credential_id for credential_id in credential_ids if credential_id in self._filter]
+        if not maybe:
+            return {}
+        return {
+            credential_id: {"Reason": reason, "Revoked": revoked_at}
+            for credential_id, (reason, revoked_at) in self._store.get_revocations(maybe).items()
+        }
+
+    def check(self, credential_id):
+        return self.check_many([credential_id]).get(credential_id)
+
+
+_lists = weakref.WeakKeyDictionary()
+_lists_lock = threading.Lock()
+
+
+# One revocation list per store, shared by every session
+def get_revocations(store=None):
+    store = store or get_store()
+    with _lists_lock:
+        if store not in _lists:
+            _lists[store] = RevocationList(store)
+        return _lists[store]
+
+
+# Revoke an issued credential; verification reports it as revoked from now on
+def revoke_credential(credential_id, reason=None, store=None):
+    get_revocations(store).revoke(credential_id, reason)
+
+
+def recent_revocations(limit=20, store=None):
+    store = store or get_store()
+    return [
+        {"Credential ID": credential_id, "Reason": reason, "Revoked": revoked_at}
+        for credential_id, reason, revoked_at in store.recent_revocations(limit)
+    ]
@@ -0,0 +1,146 @@
+import re
+import threading
+import weakref
+from array import array
+from collections import Counter
+
+from .records import Credential
+from .store import get_store
+
+SEARCH_FIELDS = ("Student Name", "Institution", "Degree")
+
+# Posting lists longer than this are only counted when nothing rarer matched;
+# common trigrams ("ver", "ity") add candidates but no ranking signal
+MAX_POSTINGS = 50_000
+# Candidates re-scored exactly for each requested result
+CANDIDATE_FACTOR = 5
+
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+# Word trigrams padded like pg_trgm, so short words and word starts still match
+def trigrams(text):
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _text(student_name, institution, degree):
+    return f"{student_name} {institution} {degree}"
+
+
+def _record_text(record):
+    return _text(*(record.get(name) or "" for name in SEARCH_FIELDS))
+
+
+# Append one document to an index's ID list and trigram postings
+def _index(ids, postings, credential_id, text):
+    ordinal = len(ids)
+    ids.append(credential_id)
+    for gram in trigrams(text):
+        gram_postings = postings.get(gram)
+        if gram_postings is None:
+            gram_postings = postings[gram] = array("I")
+        gram_postings.append(ordinal)
+
+
+# Inverted trigram index over student, institution and degree. Documents are
+# numbered in insertion order; postings are compact arrays of those numbers.
+class SearchIndex:
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._ids = []
+        self._postings = {}
+        self._built = False
+        # Records issued while the first build scans the store, or None
+        self._pending = None
+
+    # Load every stored credential; runs once, on the first search. The scan
+    # runs without holding self._lock so issuance never waits on it; records
+    # added meanwhile are buffered and indexed when the result is swapped in.
+    def _build(self):
+        with self._build_lock:
+            with self._lock:
+                if self._built:
+                    return
+                self._pending = []
+            ids, postings = [], {}
+            try:
+                for credential_id, *fields in self._store.iter_search_rows():
+                    _index(ids, postings, credential_id, _text(*fields))
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                if self._pending:
+                    scanned = set(ids)
+                    for record in self._pending:
+                        if record["Credential ID"] not in scanned:
+                            _index(ids, postings, record["Credential ID"], _record_text(record))
+                self._ids, self._postings = ids, postings
+                self._pending = None
+                self._built = True
+
+    # Index newly issued records; before the first build the store scan covers them
+    def add(self, records):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(records)
+                return
+            if not self._built:
+                return
+            for record in records:
+                _index(self._ids, self._postings, record["Credential ID"], _record_text(record))
+
+    def __len__(self):
+        return len(self._ids)
+
+    # Ranked (Credential, score) pairs; score is the share of query trigrams
+    # found in the record, ties broken by overall trigram similarity
+    def search(self, query, limit=10):
+        self._build()
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            postings = sorted((self._postings.get(gram, ()) for gram in query_grams), key=len)
+            hits = Counter()
+            for i, ordinals in enumerate(postings):
+                if i and len(ordinals) > MAX_POSTINGS and hits:
+                    break
+                hits.update(ordinals)
+            candidates = {self._ids[ordinal] for ordinal, _ in hits.most_common(limit * CANDIDATE_FACTOR)}
+
+        ranked = []
+        for row in self._store.get_many(candidates):
+            record = Credential(*row)
+            grams = trigrams(_text(*(record[name] for name in SEARCH_FIELDS)))
+            shared = len(query_grams & grams)
+            score = shared / len(query_grams)
+            ranked.append((score, shared / len(query_grams | grams), record))
+        ranked.sort(key=lambda item: item[:2], reverse=True)
+        return [(record, score) for score, _, record in ranked[:limit]]
+
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+# One search index per store, shared by every session
+def get_search_index(store=None):
+    store = store or get_store()
+    with _indexes_lock:
+        if store not in _indexes:
+            _indexes[store] = SearchIndex(store)
+        return _indexes[store]
+
+
+# Fuzzy lookup by student name, institution and/or degree
+def search_credentials(query, limit=10, store=None):
+    return get_search_index(store).search(query, limit)
@@ -0,0 +1,120 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from .keystore import get_keystore
+from .ledger import LEAF_FIELDS
+from .store import get_store
+
+# Batches smaller than this are checked in-process; process start-up would dominate
+PARALLEL_THRESHOLD = 20_000
+VERIFY_CHUNK_SIZE = 5_000
+
+# Credential fields covered by the institution's signature: the ledger leaf
+# fields plus the ones the ledger does not anchor
+SIGNED_FIELDS = LEAF_FIELDS + ("Verification Status", "Country", "Institution ID", "Perceptual Hash")
+
+
+# Canonical bytes signed for a credential. Values are compared as text,
+# the way the store keeps them.
+def signing_payload(record):
+    values = [record.get(field) for field in SIGNED_FIELDS]
+    return json.dumps([None if value is None else str(value) for value in values], separators=(",", ":")).encode()
+
+
+# New Ed25519 private key as raw bytes
+def generate_private_key():
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    return Ed25519PrivateKey.generate().private_bytes_raw()
+
+
+# Parsed keys, cached by their raw bytes so each institution's key is loaded once per process
+@lru_cache(maxsize=1024)
+def _private_key(raw):
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    return Ed25519PrivateKey.from_private_bytes(raw)
+
+
+@lru_cache(maxsize=1024)
+def _public_key(raw):
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+    return Ed25519PublicKey.from_public_bytes(raw)
+
+
+# Raw signing key of an institution, created with its keypair on first use.
+# The private key goes to the keystore and the public key to the store.
+def institution_key(institution_id, store=None, keystore=None):
+    store = store or get_store()
+    keystore = keystore or get_keystore()
+    private_key = keystore.signing_key(institution_id)
+    if private_key is None:
+        private_key = keystore.add_signing_key(institution_id, generate_private_key())
+    if institution_id not in store.public_keys([institution_id]):
+        store.add_public_key(institution_id, _private_key(private_key).public_key().public_bytes_raw())
+    return private_key
+
+
+# Hex signature over a credential's signing payload
+def sign_record(record, private_key):
+    return _private_key(private_key).sign(signing_payload(record)).hex()
+
+
+# Worker: check one chunk of (public_key, payload, signature) triples
+def _verify_chunk(items):
+    from cryptography.exceptions import InvalidSignature
+
+    results = []
+    for public_key, payload, signature in items:
+        try:
+            _public_key(public_key).verify(bytes.fromhex(signature), payload)
+        except (InvalidSignature, ValueError):
+            results.append(False)
+        else:
+            results.append(True)
+    return results
+
+
+def _verify_all(items):
+    if len(items) < PARALLEL_THRESHOLD:
+        return _verify_chunk(items)
+
+    chunks = [items[i:i + VERIFY_CHUNK_SIZE] for i in range(0, len(items), VERIFY_CHUNK_SIZE)]
+    results = []
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for chunk_results in pool.map(_verify_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+# Check many credential signatures in one call, in input order: True or
+# False, or None for credentials issued before signing. Public keys are
+# fetched in one query for all the institutions involved.
+def verify_signatures(records, store=None):
+    store = store or get_store()
+    records = list(records)
+    keys = store.public_keys({record.get("Institution ID") for record in records if record.get("Signature")})
+
+    results = [None] * len(records)
+    items, positions = [], []
+    for position, record in enumerate(records):
+        signature = record.get("Signature")
+        if not signature:
+            continue
+        public_key = keys.get(record.get("Institution ID"))
+        if public_key is None:
+            results[position] = False
+            continue
+        items.append((public_key, signing_payload(record), signature))
+        positions.append(position)
+
+    for position, valid in zip(positions, _verify_all(items)):
+        results[position] = valid
+    return results
+
+
+def verify_signature(record, store=None):
+    return verify_signatures([record], store)[0]
@@ -0,0 +1,102 @@
+import atexit
+import threading
+import time
+import weakref
+from collections import Counter
+
+from .store import get_store
+
+GROUPS = ("Country", "Institution", "Degree", "Verification Status")
+
+# Verification outcomes are written to the store in batches
+FLUSH_EVERY = 500
+FLUSH_INTERVAL = 5.0
+# Aggregates are re-read from the store at most this often, to pick up
+# credentials and verification outcomes written by other processes
+RELOAD_INTERVAL = 5.0
+
+
+# Dashboard aggregates: loaded with GROUP BY queries and kept current by this
+# process's issue and verify events, so reads rarely touch the credential
+# table. snapshot() reloads them every RELOAD_INTERVAL seconds so that work
+# done by other processes (e.g. the API server) shows up as well.
+class DashboardStats:
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._reload()
+        atexit.register(self.flush)
+
+    # Re-read the aggregates; outcomes not yet flushed are added back on top
+    def _reload(self):
+        counts = {name: Counter(dict(self._store.count_by(name))) for name in GROUPS if name != "Verification Status"}
+        counts["Verification Status"] = Counter(dict(self._store.count_by_status()))
+        verifications = Counter(self._store.verification_counts())
+        with self._lock:
+            self._counts = counts
+            self._verifications = verifications + self._pending
+            self._loaded = time.monotonic()
+
+    def record_issued(self, records):
+        with self._lock:
+            for record in records:
+                for name in GROUPS:
+                    self._counts[name][record.get(name)] += 1
+
+    # A revoked credential moves from its issued status to Revoked
+    def record_revoked(self, status):
+        with self._lock:
+            self._counts["Verification Status"][status] -= 1
+            self._counts["Verification Status"]["Revoked"] += 1
+
+    def record_verifications(self, found=0, not_found=0):
+        with self._lock:
+            self._verifications["found"] += found
+            self._verifications["not_found"] += not_found
+            self._pending["found"] += found
+            self._pending["not_found"] += not_found
+            due = (
+                sum(self._pending.values()) >= FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    # Persist buffered verification outcomes
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if pending:
+            self._store.record_verifications(pending["found"], pending["not_found"])
+
+    # Plain-data view for the dashboard; groups are limited to the top entries
+    def snapshot(self, top=10):
+        if time.monotonic() - self._loaded >= RELOAD_INTERVAL:
+            self._reload()
+        with self._lock:
+            checks = self._verifications["found"] + self._verifications["not_found"]
+            snapshot = {
+                "credentials": sum(self._counts["Verification Status"].values()),
+                "institutions": sum(1 for name, n in self._counts["Institution"].items() if name and n),
+                "verified": self._verifications["found"],
+                "success_rate": self._verifications["found"] / checks if checks else None,
+            }
+            for name in GROUPS:
+                snapshot[name] = [(key, n) for key, n in self._counts[name].most_common() if key][:top]
+        return snapshot
+
+
+_stats = weakref.WeakKeyDictionary()
+_stats_lock = threading.Lock()
+
+
+# One aggregate set per store, shared by every session
+def get_stats(store=None):
+    store = store or get_store()
+    with _stats_lock:
+        if store not in _stats:
+            _stats[store] = DashboardStats(store)
+        return _stats[store]
@@ -0,0 +1,444 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+from .identifiers import new_institution_id
+from .keystore import get_keystore
+from .records import COLUMNS, INSTITUTION_COLUMNS, Credential
+
+# Database location (override with CREDENTIAL_DB)
+DB_PATH = os.environ.get(
+    "CREDENTIAL_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "credentials.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS credentials (
+    credential_id   TEXT PRIMARY KEY,
+    student_name    TEXT NOT NULL,
+    institution     TEXT NOT NULL,
+    degree          TEXT NOT NULL,
+    issue_date      TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'Verified',
+    blockchain_hash TEXT,
+    document_hash   TEXT,
+    country         TEXT,
+    signature       TEXT,
+    institution_id  TEXT,
+    perceptual_hash TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS verification_stats (
+    outcome TEXT PRIMARY KEY,
+    total   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revocations (
+    seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+    credential_id TEXT NOT NULL UNIQUE,
+    reason        TEXT,
+    revoked_at    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS institutions (
+    institution_id TEXT PRIMARY KEY,
+    name           TEXT NOT NULL UNIQUE,
+    country        TEXT,
+    contact_email  TEXT,
+    status         TEXT NOT NULL DEFAULT 'Pending',
+    registered_at  TEXT NOT NULL,
+    reviewed_at    TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS institution_keys (
+    institution_id TEXT PRIMARY KEY,
+    public_key     BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Columns added after the first release, applied to existing databases
+MIGRATIONS = {
+    "document_hash": "TEXT",
+    "country": "TEXT",
+    "signature": "TEXT",
+    "institution_id": "TEXT",
+    "perceptual_hash": "TEXT",
+}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_credentials_student ON credentials(student_name);
+CREATE INDEX IF NOT EXISTS idx_credentials_institution ON credentials(institution);
+CREATE INDEX IF NOT EXISTS idx_credentials_degree ON credentials(degree);
+CREATE INDEX IF NOT EXISTS idx_credentials_document_hash ON credentials(document_hash);
+CREATE INDEX IF NOT EXISTS idx_credentials_institution_id ON credentials(institution_id);
+CREATE INDEX IF NOT EXISTS idx_institutions_status ON institutions(status, institution_id);
+"""
+
+# Institutions that issued credentials before the registry existed are
+# registered with this status when their credentials are linked
+LEGACY_INSTITUTION_STATUS = "Approved"
+
+# Demo records loaded into an empty database
+SEED_CREDENTIALS = [
+    ("CRED-001", "John Smith", "Tech University", "BSc Computer Science", "2020-06-15", "Verified", "a1b2c3...", None, "USA"),
+    ("CRED-002", "Emma Johnson", "Science Institute", "PhD Physics", "2018-12-10", "Verified", "d4e5f6...", None, "UK"),
+    ("CRED-003", "Michael Brown", "Global College", "MBA", "2021-05-20", "Pending", "x7y8z9...", None, "Canada"),
+    ("CRED-004", "Sarah Williams", "Tech University", "BSc Computer Science", "2023-06-15", "Verified", None, None, "USA"),
+]
+
+_SELECT = "SELECT " + ", ".join(COLUMNS.values()) + " FROM credentials"
+_SELECT_INSTITUTION = "SELECT " + ", ".join(INSTITUTION_COLUMNS.values()) + " FROM institutions"
+_INSERT = (
+    "INSERT INTO credentials (" + ", ".join(COLUMNS.values()) + ") "
+    "VALUES (" + ", ".join("?" * len(COLUMNS)) + ")"
+)
+
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Indexed credential store backed by SQLite
+class CredentialStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.executescript(INDEXES)
+        if self.count() == 0:
+            self.add_many(SEED_CREDENTIALS)
+        self._link_institutions()
+
+    def _migrate(self):
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(credentials)")}
+        for column, column_type in MIGRATIONS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE credentials ADD COLUMN {column} {column_type}")
+        # Signing keys were first stored by institution name
+        key_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(institution_keys)")}
+        if "institution" in key_columns:
+            self._conn.execute("ALTER TABLE institution_keys RENAME COLUMN institution TO institution_id")
+        # Private keys were first stored here; move them to the keystore
+        if "private_key" in key_columns:
+            get_keystore().import_keys(
+                self._conn.execute("SELECT institution_id, private_key FROM institution_keys").fetchall()
+            )
+            self._conn.executescript("""
+                CREATE TABLE institution_public_keys (
+                    institution_id TEXT PRIMARY KEY,
+                    public_key     BLOB NOT NULL
+                ) WITHOUT ROWID;
+                INSERT INTO institution_public_keys SELECT institution_id, public_key FROM institution_keys;
+                DROP TABLE institution_keys;
+                ALTER TABLE institution_public_keys RENAME TO institution_keys;
+            """)
+        self._conn.commit()
+
+    # Register every institution that has credentials but no registry entry,
+    # then link those credentials (and any name-keyed signing key) by ID
+    def _link_institutions(self):
+        with self._lock, self._conn:
+            unlinked = self._conn.execute(
+                "SELECT institution, MAX(country) FROM credentials WHERE institution_id IS NULL GROUP BY institution"
+            ).fetchall()
+            now = _now()
+            for name, country in unlinked:
+                row = self._conn.execute("SELECT institution_id FROM institutions WHERE name = ?", (name,)).fetchone()
+                if row:
+                    institution_id = row[0]
+                else:
+                    institution_id = new_institution_id()
+                    self._conn.execute(
+                        "INSERT INTO institutions (institution_id, name, country, status, registered_at, reviewed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (institution_id, name, country, LEGACY_INSTITUTION_STATUS, now, now)
+                    )
+                self._conn.execute(
+                    "UPDATE credentials SET institution_id = ? WHERE institution = ? AND institution_id IS NULL",
+                    (institution_id, name)
+                )
+                renamed = self._conn.execute(
+                    "UPDATE OR IGNORE institution_keys SET institution_id = ? WHERE institution_id = ?",
+                    (institution_id, name)
+                ).rowcount
+                if renamed:
+                    get_keystore().rename(name, institution_id)
+
+    def _to_record(self, row):
+        return Credential(*row) if row else None
+
+    def _query(self, where, params):
+        with self._lock:
+            rows = self._conn.execute(f"{_SELECT} WHERE {where}", params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    # Primary-key lookup
+    def get(self, credential_id):
+        with self._lock:
+            row = self._conn.execute(f"{_SELECT} WHERE credential_id = ?", (credential_id,)).fetchone()
+        return self._to_record(row)
+
+    # Batched primary-key lookup, returns rows in COLUMNS order
+    def get_many(self, credential_ids, chunk_size=900):
+        credential_ids = list(credential_ids)
+        rows = []
+        with self._lock:
+            for i in range(0, len(credential_ids), chunk_size):
+                chunk = credential_ids[i:i + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"{_SELECT} WHERE credential_id IN ({placeholders})", chunk
+                ).fetchall())
+        return rows
+
+    # (student, institution, degree) keys that already have a credential
+    def existing_keys(self, keys, chunk_size=900):
+        keys = set(keys)
+        students = list({key[0] for key in keys})
+        found = set()
+        with self._lock:
+            for i in range(0, len(students), chunk_size):
+                chunk = students[i:i + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT student_name, institution, degree FROM credentials "
+                    f"WHERE student_name IN ({placeholders})", chunk
+                )
+                found.update(row for row in map(tuple, rows) if row in keys)
+        return found
+
+    # (credential_id, student, institution, degree) for every credential in ID
+    # order, fetched in pages so the lock is never held for the whole scan
+    def iter_search_rows(self, page_size=50_000):
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT credential_id, student_name, institution, degree FROM credentials "
+                    "WHERE credential_id > ? ORDER BY credential_id LIMIT ?", (last, page_size)
+                ).fetchall()
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    # (credential_id, perceptual_hash) for every credential with an image document
+    def iter_perceptual_hashes(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT credential_id, perceptual_hash FROM credentials WHERE perceptual_hash IS NOT NULL"
+            ).fetchall()
+        return rows
+
+    def __contains__(self, credential_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM credentials WHERE credential_id = ?", (credential_id,)
+            ).fetchone()
+        return row is not None
+
+    # Secondary-index lookups
+    def find_by_student(self, student_name):
+        return self._query("student_name = ?", (student_name,))
+
+    def find_by_institution(self, institution):
+        return self._query("institution = ?", (institution,))
+
+    def find_by_degree(self, degree):
+        return self._query("degree = ?", (degree,))
+
+    def find_by_document_hash(self, document_hash):
+        return self._query("document_hash = ?", (document_hash,))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM credentials").fetchone()[0]
+
+    # Credential counts grouped by one display column
+    def count_by(self, name):
+        column = COLUMNS[name]
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {column}, COUNT(*) FROM credentials GROUP BY {column}"
+            ).fetchall()
+
+    # Credential counts by status, with revoked credentials counted as Revoked
+    def count_by_status(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT CASE WHEN r.credential_id IS NULL THEN c.status ELSE 'Revoked' END, COUNT(*) "
+                "FROM credentials c LEFT JOIN revocations r ON r.credential_id = c.credential_id GROUP BY 1"
+            ).fetchall()
+
+    # Revocations are append-only; seq orders them for incremental sync.
+    # Raises ValueError when the credential is already revoked.
+    def add_revocation(self, credential_id, reason=None):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO revocations (credential_id, reason, revoked_at) VALUES (?, ?, ?)",
+                    (credential_id, reason, _now())
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"{credential_id} is already revoked")
+
+    # Credential ID -> (reason, revoked_at) for the revoked IDs among these
+    def get_revocations(self, credential_ids, chunk_size=900):
+        credential_ids = list(credential_ids)
+        found = {}
+        with self._lock:
+            for i in range(0, len(credential_ids), chunk_size):
+                chunk = credential_ids[i:i + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                for credential_id, reason, revoked_at in self._conn.execute(
+                    f"SELECT credential_id, reason, revoked_at FROM revocations WHERE credential_id IN ({placeholders})",
+                    chunk
+                ):
+                    found[credential_id] = (reason, revoked_at)
+        return found
+
+    # (seq, credential_id) for revocations recorded after seq
+    def revocations_since(self, seq):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, credential_id FROM revocations WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+
+    def recent_revocations(self, limit=20):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT credential_id, reason, revoked_at FROM revocations ORDER BY seq DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def record_verifications(self, found=0, not_found=0):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO verification_stats (outcome, total) VALUES (?, ?) "
+                "ON CONFLICT(outcome) DO UPDATE SET total = total + excluded.total",
+                [("found", found), ("not_found", not_found)]
+            )
+
+    def verification_counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT outcome, total FROM verification_stats").fetchall()
+        return {"found": 0, "not_found": 0, **dict(rows)}
+
+    # Public half of an institution's signing key; the private half lives in the keystore
+    def add_public_key(self, institution_id, public_key):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO institution_keys (institution_id, public_key) VALUES (?, ?)",
+                (institution_id, public_key)
+            )
+
+    # Institution ID -> raw public key, for the institutions that have one
+    def public_keys(self, institution_ids, chunk_size=900):
+        institution_ids = list(institution_ids)
+        keys = {}
+        with self._lock:
+            for i in range(0, len(institution_ids), chunk_size):
+                chunk = institution_ids[i:i + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                keys.update(self._conn.execute(
+                    "SELECT institution_id, public_key FROM institution_keys "
+                    f"WHERE institution_id IN ({placeholders})", chunk
+                ).fetchall())
+        return keys
+
+    # Institution registry; rows are dicts keyed by INSTITUTION_COLUMNS names
+    def _to_institution(self, row):
+        return dict(zip(INSTITUTION_COLUMNS, row)) if row else None
+
+    # Raises ValueError when the name is already registered
+    def add_institution(self, institution_id, name, country=None, contact_email=None, status="Pending"):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO institutions (institution_id, name, country, contact_email, status, registered_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", (institution_id, name, country, contact_email, status, _now())
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"{name} is already registered")
+        return self.get_institution(institution_id)
+
+    def get_institution(self, institution_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"{_SELECT_INSTITUTION} WHERE institution_id = ?", (institution_id,)
+            ).fetchone()
+        return self._to_institution(row)
+
+    # Name -> institution for the registered names among the given ones
+    def institutions_by_name(self, names, chunk_size=900):
+        names = list(names)
+        found = {}
+        with self._lock:
+            for i in range(0, len(names), chunk_size):
+                chunk = names[i:i + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in self._conn.execute(f"{_SELECT_INSTITUTION} WHERE name IN ({placeholders})", chunk):
+                    institution = self._to_institution(row)
+                    found[institution["Name"]] = institution
+        return found
+
+    # One page of institutions in registration order (IDs are time-ordered),
+    # optionally filtered by status. Keyset pagination: pass the last ID of
+    # the previous page as after_id, so every page is one index range scan.
+    def list_institutions(self, status=None, after_id="", limit=50):
+        where, params = "institution_id > ?", [after_id]
+        if status:
+            where += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            rows = self._conn.execute(
+                f"{_SELECT_INSTITUTION} WHERE {where} ORDER BY institution_id LIMIT ?", params + [limit]
+            ).fetchall()
+        return [self._to_institution(row) for row in rows]
+
+    def count_institutions(self, status=None):
+        with self._lock:
+            if status:
+                return self._conn.execute("SELECT COUNT(*) FROM institutions WHERE status = ?", (status,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM institutions").fetchone()[0]
+
+    # Move an institution out of the review queue; only pending entries change
+    def review_institution(self, institution_id, status):
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                "UPDATE institutions SET status = ?, reviewed_at = ? WHERE institution_id = ? AND status = 'Pending'",
+                (status, _now(), institution_id)
+            ).rowcount
+        return updated == 1
+
+    # Accepts Credential records, dicts keyed by display names, or tuples in
+    # COLUMNS order; short tuples are padded with NULLs for trailing columns
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        rows = [
+            r.astuple() if isinstance(r, Credential)
+            else tuple(r.get(name) for name in COLUMNS) if isinstance(r, dict)
+            else tuple(r) + (None,) * (len(COLUMNS) - len(r))
+            for r in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(_INSERT, rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# One store per process, shared by every session
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CredentialStore()
+    return _store